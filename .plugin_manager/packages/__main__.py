@@ -0,0 +1,25 @@
+# ../__main__.py
+
+"""Runs the plugin manager's commands from the command line.
+
+Usage: python .plugin_manager/packages <command> [arguments]
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import sys
+from pathlib import Path
+
+# The commands import the common package from this directory
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Package
+from common.cli import main
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+if __name__ == "__main__":
+    sys.exit(main())
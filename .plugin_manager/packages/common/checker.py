@@ -0,0 +1,224 @@
+# ../common/checker.py
+
+"""Provides functions for checking plugins for standards issues."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import hashlib
+import json
+import os
+import subprocess
+from collections import Counter
+from functools import cache
+from pathlib import Path
+
+# Package
+from .constants import CACHE_DIR, START_DIR
+from .functions import get_file_hash, get_plugin_check_path, get_plugin_name
+from .result_cache import ResultCache
+from .standards import check_file_standards, check_standards
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "CheckResults",
+    "check_files",
+    "check_plugins",
+    "get_plugin_hash",
+    "run_ruff",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+MAX_CACHED_RESULTS = 1000
+MAX_CACHED_FILE_HASHES = 50000
+_ruff_config_files = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CheckResults(dict):
+    """Maps each checked plugin name to the list of its findings.
+
+    Each finding is a dictionary holding the rule code, message, filename,
+    row and column.
+    """
+
+    def add_findings(self, findings):
+        """Add the findings to the lists of the plugins they were found in."""
+        for finding in findings:
+            plugin_name = get_plugin_name(finding["filename"])
+            self.setdefault(plugin_name, []).append(finding)
+
+    def replace_files(self, filenames, findings):
+        """Replace the findings for the given files after re-checking them.
+
+        Returns the names of the plugins whose findings were changed.
+        """
+        filenames = set(filenames)
+        changed = {get_plugin_name(filename) for filename in filenames}
+        for plugin_name in changed.intersection(self):
+            self[plugin_name] = [
+                finding for finding in self[plugin_name]
+                if finding["filename"] not in filenames
+            ]
+        self.add_findings(findings)
+        return changed.intersection(self)
+
+    def get_rule_counts(self, plugin_name):
+        """Return the number of the plugin's findings for each rule code."""
+        return Counter(finding["code"] for finding in self[plugin_name])
+
+    @property
+    def total(self):
+        """Return the number of findings across every plugin."""
+        return sum(map(len, self.values()))
+
+    def to_json(self):
+        """Return the findings as JSON, sorted by plugin, file and row."""
+        return json.dumps(
+            {
+                plugin_name: sorted(
+                    findings,
+                    key=lambda item: (item["filename"], item["row"]),
+                )
+                for plugin_name, findings in sorted(self.items())
+            },
+            indent=4,
+        )
+
+    def save(self, path):
+        """Write the findings to the given path as JSON."""
+        Path(path).write_text(self.to_json())
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def run_ruff(paths):
+    """Run a single ruff check over all paths and return its findings."""
+    if not paths:
+        return []
+    result = subprocess.run(
+        [
+            "ruff",
+            "check",
+            "--output-format",
+            "json",
+            "--exit-zero",
+            *map(str, paths),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=START_DIR,
+    )
+    return [
+        {
+            "code": item["code"] or "SyntaxError",
+            "message": item["message"],
+            "filename": item["filename"],
+            "row": item["location"]["row"],
+            "column": item["location"]["column"],
+        }
+        for item in json.loads(result.stdout or "[]")
+    ]
+
+
+def check_files(filenames):
+    """Return the ruff and standards findings for only the given files.
+
+    Files that no longer exist are skipped, so their findings are dropped.
+    """
+    return [
+        *run_ruff(
+            [filename for filename in filenames if Path(filename).is_file()],
+        ),
+        *check_file_standards(filenames),
+    ]
+
+
+@cache
+def get_ruff_version():
+    """Return the installed ruff's version, which is part of each hash."""
+    return subprocess.run(
+        ["ruff", "--version"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+def get_plugin_hash(plugin_name, file_hashes=None):
+    """Return a hash of the plugin's sources and its ruff settings.
+
+    file_hashes, if given, is a ResultCache used to avoid re-reading files
+    whose mtime and size have not changed.
+    """
+    plugin_path = get_plugin_check_path(plugin_name)
+    digest = hashlib.sha256(get_ruff_version().encode())
+    for directory in [plugin_path, *Path(plugin_path).parents]:
+        for name in _ruff_config_files:
+            path = Path(directory, name)
+            if path.is_file():
+                digest.update(f"{path}\0".encode())
+                digest.update(get_file_hash(path, file_hashes).encode())
+
+    for root, dirs, files in os.walk(plugin_path):
+        dirs.sort()
+        for name in sorted(files):
+            if not name.endswith(".py"):
+                continue
+            path = Path(root, name)
+            digest.update(f"{os.path.relpath(path, plugin_path)}\0".encode())
+            digest.update(get_file_hash(path, file_hashes).encode())
+    return digest.hexdigest()
+
+
+def check_plugins(plugin_names, *, use_cache=True):
+    """Check every given plugin with one ruff run and return the results.
+
+    Plugins whose sources and settings are unchanged since they were last
+    checked are answered from the cache and not passed to ruff. The
+    plugin standards rules are then run and merged into the results.
+    """
+    results = CheckResults((plugin_name, []) for plugin_name in plugin_names)
+    cached_results = ResultCache(
+        CACHE_DIR / "checker_results.json",
+        max_entries=MAX_CACHED_RESULTS,
+    )
+    file_hashes = ResultCache(
+        CACHE_DIR / "checker_file_hashes.json",
+        max_entries=MAX_CACHED_FILE_HASHES,
+    )
+    hashes = {}
+    for plugin_name in plugin_names:
+        if not get_plugin_check_path(plugin_name).is_dir():
+            continue
+        plugin_hash = get_plugin_hash(plugin_name, file_hashes)
+        findings = cached_results.get(plugin_hash) if use_cache else None
+        if findings is None:
+            hashes[plugin_name] = plugin_hash
+        else:
+            results[plugin_name] = list(findings)
+
+    paths = [
+        get_plugin_check_path(plugin_name).relpath(START_DIR)
+        for plugin_name in hashes
+    ]
+    checked = CheckResults((plugin_name, []) for plugin_name in hashes)
+    checked.add_findings(run_ruff(paths))
+    for plugin_name, findings in checked.items():
+        cached_results.set(hashes[plugin_name], findings)
+    results.update(checked)
+    cached_results.save()
+    file_hashes.save()
+    results.add_findings(check_standards(plugin_names))
+    return results
+
@@ -0,0 +1,536 @@
+# ../common/cli.py
+
+"""Runs the plugin manager's commands from the command line.
+
+Nothing here imports tkinter, so the commands can be run without a display.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import argparse
+import json
+import queue
+import sys
+from contextlib import redirect_stdout
+from fnmatch import fnmatch
+
+# Package
+from .checker import check_plugins
+from .cloning import CLONE_WORKERS, clone_repositories
+from .creation import (
+    create_plugin,
+    get_conditional_file_or_directory_data,
+    get_conditional_paths_data,
+    get_conditional_python_file_data,
+    get_configuration_errors,
+    get_prefixed_plugin_name,
+    is_valid_plugin_name,
+)
+from .fs_snapshot import FileSystemSnapshot
+from .git_sync import SYNC_WORKERS, format_sync_table, sync_repositories
+from .link_collector import find_dangling_links, get_collect_roots
+from .link_manifest import (
+    format_verify_result,
+    get_repair_operations,
+    get_unlink_operations,
+    link_manifest,
+)
+from .link_planner import format_link_plan, get_plan_operations, plan_links
+from .links import apply_link_operations, format_link_result
+from .releases import (
+    get_new_version,
+    get_plugin_info,
+    has_uncommitted_changes,
+    save_release,
+    update_version,
+)
+from .repositories import find_repositories
+from .runner import CommandRunner
+from .source_python import get_server_link_operations, get_supported_games
+from .workspace import workspace
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "get_parser",
+    "main",
+    "select_names",
+)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def main(argv=None):
+    """Run the command given by the arguments and return the exit code.
+
+    With --json, a single JSON document describing the results is written
+    to stdout and all progress output is written to stderr instead.
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    with redirect_stdout(sys.stderr if args.json else sys.stdout):
+        try:
+            result = args.function(args)
+        except ValueError as error:
+            parser.error(str(error))
+
+    if args.json:
+        print(json.dumps({"command": args.command, **result}, indent=4))
+    return 0 if result["succeeded"] else 1
+
+
+def get_parser():
+    """Return the parser for the subcommands and their options."""
+    parser = argparse.ArgumentParser(
+        prog="plugin_manager",
+        description="Run plugin manager commands without the window.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="write the results to stdout as JSON",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check = subparsers.add_parser("check", help="check plugins")
+    _add_selection_arguments(check, "plugin")
+    check.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="check every plugin even if it has not changed",
+    )
+    check.set_defaults(function=run_check)
+
+    link = subparsers.add_parser(
+        "link",
+        help="create, repair and prune plugin links",
+        description=(
+            "Bring the selected plugins' links up to date. With --all, "
+            "dangling links left by deleted plugins are removed too."
+        ),
+    )
+    _add_selection_arguments(link, "plugin")
+    link.add_argument("--dry-run", action="store_true")
+    link.set_defaults(function=run_link)
+
+    link_server = subparsers.add_parser(
+        "link-server",
+        help="link Source.Python to game installations",
+    )
+    _add_selection_arguments(link_server, "game")
+    link_server.add_argument("--dry-run", action="store_true")
+    link_server.add_argument(
+        "--rescan",
+        action="store_true",
+        help="rescan the server directories for installations",
+    )
+    link_server.set_defaults(function=run_link_server)
+
+    links = subparsers.add_parser(
+        "links",
+        help="verify, repair or remove recorded links",
+        description=(
+            "Check the links recorded when they were created, without "
+            "scanning the directories they are in."
+        ),
+    )
+    links.add_argument("action", choices=("verify", "repair", "unlink"))
+    _add_selection_arguments(links, "owner")
+    links.add_argument(
+        "--game",
+        action="store_true",
+        help="select games linked by link-server instead of plugins",
+    )
+    links.add_argument("--dry-run", action="store_true")
+    links.set_defaults(function=run_links)
+
+    prune = subparsers.add_parser(
+        "prune",
+        help="remove dangling links",
+        description=(
+            "Remove the dangling links into the workspace or Source.Python "
+            "from LINK_BASE_DIRECTORY and every game installation."
+        ),
+    )
+    prune.add_argument("--dry-run", action="store_true")
+    prune.add_argument(
+        "--rescan",
+        action="store_true",
+        help="rescan the server directories for installations",
+    )
+    prune.set_defaults(function=run_prune)
+
+    release = subparsers.add_parser("release", help="create releases")
+    _add_selection_arguments(release, "plugin")
+    release.add_argument(
+        "--bump",
+        choices=("major", "minor", "patch"),
+        help="update, commit and push the version before the release",
+    )
+    release.set_defaults(function=run_release)
+
+    clone = subparsers.add_parser("clone", help="clone repositories")
+    _add_selection_arguments(clone, "repository")
+    clone.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore cached GitHub responses",
+    )
+    clone.add_argument("--workers", type=int, default=None)
+    clone.set_defaults(function=run_clone)
+
+    sync = subparsers.add_parser("sync", help="fetch plugin repositories")
+    _add_selection_arguments(sync, "plugin")
+    sync.add_argument("--fast-forward", action="store_true")
+    sync.add_argument("--workers", type=int, default=None)
+    sync.set_defaults(function=run_sync)
+
+    create = subparsers.add_parser("create", help="create a plugin")
+    create.add_argument("name")
+    create.add_argument(
+        "--python-file",
+        action="append",
+        default=[],
+        help="conditional python file to create, such as commands.py",
+    )
+    create.add_argument(
+        "--translations",
+        action="append",
+        default=[],
+        help="conditional python file to create a translations file for",
+    )
+    create.add_argument(
+        "--path",
+        action="append",
+        default=[],
+        help="conditional file, directory or path to create",
+    )
+    create.add_argument(
+        "--github-repo",
+        help="initialize git and create the GitHub repository by this name",
+    )
+    create.set_defaults(function=run_create)
+    return parser
+
+
+def select_names(names, patterns, *, select_all=False):
+    """Return the names matching any of the glob patterns, in order.
+
+    Raises ValueError if no patterns are given, or a pattern matches
+    nothing, so typos do not silently select fewer names.
+    """
+    names = sorted(names)
+    if select_all:
+        return names
+
+    if not patterns:
+        msg = "Give at least one name or glob pattern, or use --all."
+        raise ValueError(msg)
+
+    selected = []
+    for pattern in patterns:
+        matches = [name for name in names if fnmatch(name, pattern)]
+        if not matches:
+            msg = f'Nothing matches "{pattern}".'
+            raise ValueError(msg)
+        selected.extend(name for name in matches if name not in selected)
+    return selected
+
+
+def run_check(args):
+    workspace.refresh()
+    plugin_names = select_names(
+        workspace.names,
+        args.names,
+        select_all=args.all,
+    )
+    results = check_plugins(plugin_names, use_cache=not args.no_cache)
+    for plugin_name, findings in sorted(results.items()):
+        print(f"{plugin_name}: {len(findings)} finding(s)")
+        for finding in sorted(
+            findings,
+            key=lambda item: (item["filename"], item["row"]),
+        ):
+            print(
+                f"    {finding['filename']}:{finding['row']}:"
+                f"{finding['column']}: {finding['code']} {finding['message']}",
+            )
+    return {
+        "succeeded": not results.total,
+        "total": results.total,
+        "results": {
+            plugin_name: results[plugin_name] for plugin_name in sorted(results)
+        },
+    }
+
+
+def run_link(args):
+    workspace.refresh()
+    plugin_names = select_names(
+        workspace.names,
+        args.names,
+        select_all=args.all,
+    )
+    plan = plan_links(plugin_names, prune_all=args.all)
+    if not args.dry_run:
+        link_manifest.adopt(plan["linked"])
+    print(*format_link_plan(plan), sep="\n")
+    operations = {}
+    for operation in get_plan_operations(plan):
+        # Link directories are shared by the plugins, and come first
+        name = operation.get("plugin", "Link directories")
+        operations.setdefault(name, []).append(operation)
+    result = _apply_links(operations, args.dry_run)
+    result["conflicts"] = plan["conflicts"]
+    result["succeeded"] = result["succeeded"] and not plan["conflicts"]
+    return result
+
+
+def run_link_server(args):
+    games = get_supported_games(force=args.rescan)
+    snapshot = FileSystemSnapshot()
+    return _apply_links(
+        {
+            game: [
+                operation | {"game": game}
+                for operation in get_server_link_operations(
+                    games[game],
+                    snapshot,
+                )
+            ]
+            for game in select_names(games, args.names, select_all=args.all)
+        },
+        args.dry_run,
+    )
+
+
+def run_links(args):
+    owner_type = "game" if args.game else "plugin"
+    names = select_names(
+        link_manifest.get_owners(owner_type),
+        args.names,
+        select_all=args.all,
+    )
+    results = link_manifest.verify(owner_type, names)
+    for result in results:
+        print(format_verify_result(result))
+    if args.action == "verify":
+        return {
+            "succeeded": all(result["status"] == "ok" for result in results),
+            "results": results,
+        }
+
+    if args.action == "repair":
+        operations = get_repair_operations(results)
+    else:
+        operations = get_unlink_operations(results)
+        if not args.dry_run:
+            link_manifest.forget(
+                result["dest"] for result in results
+                if result["status"] not in ("ok", "dangling")
+            )
+
+    grouped = {}
+    for operation in operations:
+        grouped.setdefault(operation[owner_type], []).append(operation)
+    return _apply_links(grouped, args.dry_run)
+
+
+def run_prune(args):
+    roots = get_collect_roots(get_supported_games(force=args.rescan))
+    operations = {}
+    for operation in find_dangling_links(roots):
+        operations.setdefault(operation["owner"], []).append(operation)
+    print(f"Found {sum(map(len, operations.values()))} dangling links.")
+    return _apply_links(operations, args.dry_run)
+
+
+def run_release(args):
+    workspace.refresh()
+    plugin_names = select_names(
+        [name for name, values in workspace.items() if values["is_git"]],
+        args.names,
+        select_all=args.all,
+    )
+    results = {}
+    for plugin_name in plugin_names:
+        result = results[plugin_name] = {
+            "version": None,
+            "zip": None,
+            "error": None,
+        }
+        if has_uncommitted_changes(plugin_name):
+            result["error"] = "uncommitted changes"
+            print(f"{plugin_name} has uncommitted changes, skipping release")
+            continue
+
+        version = get_plugin_info(plugin_name)["version"]
+        if args.bump is not None:
+            update_type = args.bump.upper()
+            new_version = get_new_version(version, update_type)
+            if new_version is not None:
+                commands = update_version(plugin_name, update_type, new_version)
+                if not _run_commands(commands):
+                    result["error"] = "version update failed"
+                    print("Version update failed, release was not created.")
+                    continue
+                version = new_version
+
+        result["version"] = version
+        zip_path = save_release(plugin_name, version)
+        if zip_path is None:
+            result["error"] = "release already exists"
+        else:
+            result["zip"] = str(zip_path)
+
+    return {
+        "succeeded": not any(result["error"] for result in results.values()),
+        "results": results,
+    }
+
+
+def run_clone(args):
+    workspace.refresh()
+    repos = find_repositories(force=args.refresh)
+    names = select_names(repos, args.names, select_all=args.all)
+    results = clone_repositories(
+        repos={name: repos[name] for name in names},
+        max_workers=args.workers or CLONE_WORKERS,
+        on_output=lambda name, line: print(f"[{name}] {line}", end=""),
+    )
+    workspace.refresh()
+    for name, result in sorted(results.items()):
+        status = "FAILED" if result["returncode"] else "ok"
+        print(f"{name}: {status} ({result['duration']:.1f}s)")
+    return {
+        "succeeded": not any(
+            result["returncode"] for result in results.values()
+        ),
+        "results": results,
+    }
+
+
+def run_sync(args):
+    workspace.refresh()
+    repos = {
+        name: values["path"]
+        for name, values in workspace.items()
+        if values["is_git"]
+    }
+    names = select_names(repos, args.names, select_all=args.all)
+    results = sync_repositories(
+        repos={name: repos[name] for name in names},
+        fast_forward=args.fast_forward,
+        max_workers=args.workers or SYNC_WORKERS,
+    )
+    print("\n".join(format_sync_table(results)))
+    return {
+        "succeeded": not any(result["error"] for result in results),
+        "results": results,
+    }
+
+
+def run_create(args):
+    message = get_configuration_errors()
+    if message:
+        raise ValueError(message)
+
+    if not is_valid_plugin_name(args.name):
+        msg = (
+            "Plugin names must start with a lowercase letter and only "
+            "contain lowercase letters, numbers and underscores."
+        )
+        raise ValueError(msg)
+
+    plugin_name = get_prefixed_plugin_name(args.name)
+    workspace.refresh()
+    if plugin_name in workspace:
+        msg = f"Plugin name already exists: {plugin_name}"
+        raise ValueError(msg)
+
+    python_files = get_conditional_python_file_data()
+    paths = [
+        *get_conditional_file_or_directory_data(plugin_name),
+        *get_conditional_paths_data(plugin_name),
+    ]
+    for given, allowed in (
+        (args.python_file + args.translations, python_files),
+        (args.path, paths),
+    ):
+        invalid = sorted(set(given).difference(allowed))
+        if invalid:
+            msg = (
+                f"Invalid choice(s): {', '.join(invalid)}. "
+                f"Choose from: {', '.join(allowed) or 'nothing'}"
+            )
+            raise ValueError(msg)
+
+    base_path = create_plugin(
+        plugin_name,
+        python_files=args.python_file + args.translations,
+        translation_files=args.translations,
+        paths=args.path,
+        repo_name=args.github_repo,
+    )
+    return {
+        "succeeded": True,
+        "results": {
+            "plugin": plugin_name,
+            "path": str(base_path),
+        },
+    }
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _add_selection_arguments(parser, kind):
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar=kind,
+        help=f"{kind} name or glob pattern",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help=f"select every {kind}",
+    )
+
+
+def _apply_links(operations, dry_run):
+    results = {}
+    for name, name_operations in operations.items():
+        print(f"===== {name} =====")
+        results[name] = apply_link_operations(
+            name_operations,
+            dry_run=dry_run,
+            on_results=lambda batch: print(
+                *map(format_link_result, batch),
+                sep="\n",
+            ),
+        )
+        link_manifest.record(results[name])
+    return {
+        "succeeded": not any(
+            result["error"] is not None
+            for name_results in results.values()
+            for result in name_results
+        ),
+        "results": results,
+    }
+
+
+def _run_commands(commands):
+    """Run the commands, print their output and return if all passed."""
+    runner = CommandRunner(commands).start()
+    while not runner.done.is_set() or not runner.output.empty():
+        try:
+            print(runner.output.get(timeout=0.1), end="")
+        except queue.Empty:
+            continue
+    return runner.succeeded
@@ -0,0 +1,182 @@
+# ../common/cloning.py
+
+"""Provides functions for cloning plugin repositories."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import functools
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Site-Package
+from path import Path
+
+# Package
+from .constants import CACHE_DIR, START_DIR, config
+from .scheduler import RESOURCE_LIMITS, scheduler
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "CLONE_STRATEGIES",
+    "CLONE_STRATEGY",
+    "CLONE_WORKERS",
+    "MIRROR_DIR",
+    "clone_repositories",
+    "clone_repository",
+    "get_clone_args",
+    "get_mirror_path",
+    "update_mirror",
+    "update_mirrors_in_background",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+CLONE_WORKERS = int(
+    config.get("CLONE_WORKERS") or RESOURCE_LIMITS["network"],
+)
+CLONE_STRATEGIES = ("full", "shallow", "blobless", "mirror")
+CLONE_STRATEGY = config.get("CLONE_STRATEGY") or "full"
+if CLONE_STRATEGY not in CLONE_STRATEGIES:
+    msg = (
+        f"Invalid CLONE_STRATEGY '{CLONE_STRATEGY}', must be one of: "
+        f"{', '.join(CLONE_STRATEGIES)}"
+    )
+    raise ValueError(msg)
+CLONE_DEPTH = int(config.get("CLONE_DEPTH") or 1)
+MIRROR_DIR = Path(config.get("MIRROR_DIRECTORY") or CACHE_DIR / "mirrors")
+
+# Only one git process should update a mirror at a time
+_mirror_locks = {}
+_mirror_locks_lock = threading.Lock()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_mirror_path(url):
+    """Return the bare mirror repository path for the given url."""
+    owner, name = re.split(r"[/:]", url.rstrip("/"))[-2:]
+    if not name.endswith(".git"):
+        name += ".git"
+    return MIRROR_DIR / owner / name
+
+
+def get_clone_args(name, url, strategy=CLONE_STRATEGY):
+    """Return the git clone arguments for the given strategy."""
+    args = ["git", "clone", "--progress"]
+    if strategy == "shallow":
+        args.extend(["--depth", str(CLONE_DEPTH)])
+    elif strategy == "blobless":
+        args.append("--filter=blob:none")
+    elif strategy == "mirror":
+        # Objects are copied out of the mirror, so pruning or deleting the
+        #   mirror can never break a checkout that borrowed from it
+        args.extend([
+            "--reference-if-able",
+            str(get_mirror_path(url)),
+            "--dissociate",
+        ])
+    return [*args, url, str(START_DIR / name)]
+
+
+def update_mirror(url, on_output=None, name=None):
+    """Create the mirror for the url, or fetch into it if it exists."""
+    path = get_mirror_path(url)
+    with _get_mirror_lock(path):
+        if path.is_dir():
+            args = [
+                "git", "--git-dir", str(path), "remote", "update", "--prune",
+            ]
+        else:
+            path.parent.makedirs_p()
+            args = ["git", "clone", "--mirror", "--progress", url, str(path)]
+        return _run(args, name or url, on_output)
+
+
+def update_mirrors_in_background():
+    """Fetch into every existing mirror as network jobs and return them."""
+    if CLONE_STRATEGY != "mirror" or not MIRROR_DIR.is_dir():
+        return []
+
+    return [
+        scheduler.submit(
+            f"Update mirror {path.parent.name}/{path.name}",
+            functools.partial(_update_existing_mirror, path),
+            resource="network",
+        )
+        for owner in MIRROR_DIR.dirs()
+        for path in owner.dirs("*.git")
+    ]
+
+
+def clone_repository(name, url, on_output=None, strategy=CLONE_STRATEGY):
+    """Clone the repository into the workspace.
+
+    Each line of git's output is passed to on_output along with the name.
+    Returns a dictionary holding the return code and duration.
+    """
+    start = time.perf_counter()
+    if strategy == "mirror":
+        update_mirror(url, on_output, name)
+    returncode = _run(get_clone_args(name, url, strategy), name, on_output)
+    return {
+        "returncode": returncode,
+        "duration": time.perf_counter() - start,
+    }
+
+
+def clone_repositories(repos, max_workers=CLONE_WORKERS, on_output=None):
+    """Clone the given {name: url} repositories in parallel.
+
+    Returns a dictionary of each name to its clone_repository result.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            name: executor.submit(clone_repository, name, url, on_output)
+            for name, url in repos.items()
+        }
+    return {name: future.result() for name, future in futures.items()}
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _run(args, name, on_output):
+    process = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    for line in process.stdout:
+        if on_output is not None:
+            on_output(name, line)
+    return process.wait()
+
+
+def _get_mirror_lock(path):
+    with _mirror_locks_lock:
+        return _mirror_locks.setdefault(str(path), threading.Lock())
+
+
+def _update_existing_mirror(path):
+    lock = _get_mirror_lock(path)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        subprocess.run(
+            ["git", "--git-dir", str(path), "remote", "update", "--prune"],
+            capture_output=True,
+            check=False,
+        )
+    finally:
+        lock.release()
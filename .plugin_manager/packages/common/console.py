@@ -0,0 +1,272 @@
+# ../common/console.py
+
+"""Provides a console widget that batches writes and bounds its scrollback."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import tkinter as tk
+from collections import deque
+
+# Package
+from .constants import config
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "Console",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+SCROLLBACK_LINES = int(config.get("CONSOLE_SCROLLBACK") or 10000)
+
+# Milliseconds between flushes of buffered writes to the widget
+FLUSH_INTERVAL = 50
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Console(tk.Frame):
+    """A read-only console with batched writes, filtering and search.
+
+    write() may be called from any thread. Writes are buffered and
+    inserted into the Text widget in one batch per flush interval. Only
+    the last scrollback lines are retained, both in the widget and in the
+    line buffer used for filtering. Output can be split into sections,
+    each of which keeps its own lines together under a header.
+    """
+
+    def __init__(self, master, scrollback=SCROLLBACK_LINES):
+        """Create the console, retaining up to scrollback lines."""
+        super().__init__(master)
+        self.lines = deque(maxlen=scrollback)
+        self.scrollback = scrollback
+        self.sections = []
+        self._pending = deque()
+        self._partial = {}
+        self._filter = ""
+
+        toolbar = tk.Frame(self)
+        toolbar.pack(fill="x", pady=(0, 5))
+        tk.Label(toolbar, text="Filter:").pack(side="left")
+        filter_entry = tk.Entry(toolbar, width=30)
+        filter_entry.pack(side="left", padx=(0, 10))
+        filter_entry.bind(
+            "<KeyRelease>",
+            lambda _: self.set_filter(filter_entry.get()),
+        )
+        tk.Label(toolbar, text="Find:").pack(side="left")
+        search_entry = tk.Entry(toolbar, width=30)
+        search_entry.pack(side="left")
+        search_entry.bind(
+            "<Return>",
+            lambda _: self.find_next(search_entry.get()),
+        )
+
+        scrollbar = tk.Scrollbar(self)
+        scrollbar.pack(side="right", fill="y")
+        self.text = tk.Text(
+            self,
+            wrap="word",
+            font=("consolas", 10),
+            state="disabled",
+            yscrollcommand=scrollbar.set,
+        )
+        self.text.pack(side="left", fill="both", expand=True)
+        scrollbar.configure(command=self.text.yview)
+        self.text.tag_config("stdout", foreground="black")
+        self.text.tag_config("stderr", foreground="red")
+        self.text.tag_config("header", font=("consolas", 10, "bold"))
+        self.text.tag_config("match", background="yellow")
+        self.after(FLUSH_INTERVAL, self._flush_loop)
+
+    def write(self, text, tag="stdout", section=None):
+        """Buffer the text to be written on the next flush."""
+        self._pending.append((text, tag, section))
+
+    def add_section(self, name):
+        """Add a section that output can be written to by its name."""
+        self._flush()
+        self.sections.append(name)
+        self._set_state("normal")
+        self.text.insert("end", f"===== {name} =====\n", ("header",))
+        line = int(self.text.index("end-1c").split(".")[0])
+        self.text.insert("end", "\n")
+        self._set_section_mark(name, f"{line}.0")
+        self._set_state("disabled")
+
+    def clear(self):
+        """Remove all output, buffered or shown, and every section."""
+        self._pending.clear()
+        self._partial.clear()
+        self.lines.clear()
+        self.sections.clear()
+        self._set_state("normal")
+        self.text.delete("1.0", "end")
+        self._set_state("disabled")
+
+    def set_filter(self, pattern):
+        """Only show the retained lines that contain the pattern."""
+        if pattern == self._filter:
+            return
+        self._filter = pattern
+        self._flush()
+        self._render()
+
+    def find_next(self, pattern):
+        """Highlight every match and scroll to the next one."""
+        self.text.tag_remove("match", "1.0", "end")
+        if not pattern:
+            return
+
+        count = tk.IntVar()
+        index = "1.0"
+        first = None
+        current = self.text.index("insert")
+        following = None
+        while True:
+            index = self.text.search(
+                pattern,
+                index,
+                stopindex="end",
+                nocase=True,
+                count=count,
+            )
+            if not index:
+                break
+            end = f"{index}+{count.get()}c"
+            self.text.tag_add("match", index, end)
+            first = first or index
+            if following is None and self.text.compare(index, ">", current):
+                following = index
+            index = end
+
+        target = following or first
+        if target is not None:
+            self.text.mark_set("insert", target)
+            self.text.see(target)
+
+    def _matches(self, line):
+        return self._filter.lower() in line.lower()
+
+    def _set_state(self, state):
+        self.text.configure(state=state)
+
+    def _set_section_mark(self, name, index):
+        mark = f"section-{name}"
+        self.text.mark_set(mark, index)
+        self.text.mark_gravity(mark, "right")
+
+    def _get_index(self, section):
+        if section is None or section not in self.sections:
+            return "end"
+        return f"section-{section}"
+
+    def _flush_loop(self):
+        if not self.winfo_exists():
+            return
+        self._flush()
+        self.after(FLUSH_INTERVAL, self._flush_loop)
+
+    def _flush(self):
+        if not self._pending:
+            return
+
+        inserts = []
+        while self._pending:
+            text, tag, section = self._pending.popleft()
+            partial, _ = self._partial.get(section, ("", tag))
+            *complete, partial = (partial + text).split("\n")
+            self._partial[section] = (partial, tag)
+            position = len(self.sections)
+            self.lines.extend(
+                (line, tag, section, position) for line in complete
+            )
+            if not self._filter:
+                inserts.append((self._get_index(section), text, tag))
+            else:
+                inserts.extend(
+                    (self._get_index(section), f"{line}\n", tag)
+                    for line in complete
+                    if self._matches(line)
+                )
+
+        at_bottom = self.text.yview()[1] >= 1.0
+        self._set_state("normal")
+
+        # Group consecutive writes to the same index into one insert
+        index, args = None, []
+        for insert_index, text, tag in inserts:
+            if insert_index != index and args:
+                self.text.insert(index, *args)
+                args = []
+            index = insert_index
+            args.extend((text, (tag,)))
+        if args:
+            self.text.insert(index, *args)
+
+        # The oldest lines shown are trimmed from the top. Section marks in
+        #   the trimmed lines move to the top, where the rest of their
+        #   section still is.
+        excess = int(self.text.index("end-1c").split(".")[0])
+        excess -= self.scrollback + 1
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+        self._set_state("disabled")
+        if at_bottom:
+            self.text.see("end")
+
+    def _render(self):
+        """Rebuild the widget's contents from the retained lines.
+
+        Lines that are still being written are only shown when there is
+        no filter, the same as when they were first written.
+        """
+        args = []
+        marks = {}
+        line_number = 1
+
+        def add_lines(name, position=None):
+            nonlocal line_number
+            for line, tag, section, added in self.lines:
+                if section != name or not self._matches(line):
+                    continue
+                if position is not None and added != position:
+                    continue
+                args.extend((f"{line}\n", (tag,)))
+                line_number += 1
+
+        def add_partial(name):
+            partial, tag = self._partial.get(name, ("", None))
+            if self._filter or not partial:
+                return 0
+            args.extend((partial, (tag,)))
+            return len(partial)
+
+        # Unsectioned output stays where it was written relative to the
+        #   section headers
+        add_lines(None, position=0)
+        for position, name in enumerate(self.sections, 1):
+            args.extend((f"===== {name} =====\n", ("header",)))
+            line_number += 1
+            add_lines(name)
+            marks[name] = f"{line_number}.{add_partial(name)}"
+            args.extend(("\n", ()))
+            line_number += 1
+            add_lines(None, position=position)
+        add_partial(None)
+
+        self._set_state("normal")
+        self.text.delete("1.0", "end")
+        if args:
+            self.text.insert("end", *args)
+        for name, index in marks.items():
+            self._set_section_mark(name, index)
+        self._set_state("disabled")
+        self.text.see("end")
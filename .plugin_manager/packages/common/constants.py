@@ -18,15 +18,16 @@ from path import Path
 # >> ALL
 # =============================================================================
 __all__ = (
-    'config',
-    'CONDITIONAL_PYTHON_FILES_DIR',
-    'LINK_BASE_DIR',
-    'PLATFORM',
-    'PLUGIN_LIST',
-    'PLUGIN_PRIMARY_FILES_DIR',
-    'PLUGIN_REPO_ROOT_FILES_DIR',
-    'RELEASE_DIR',
-    'START_DIR',
+    "BASE_PATHS",
+    "CACHE_DIR",
+    "CONDITIONAL_PYTHON_FILES_DIR",
+    "LINK_BASE_DIR",
+    "PLATFORM",
+    "PLUGIN_PRIMARY_FILES_DIR",
+    "PLUGIN_REPO_ROOT_FILES_DIR",
+    "RELEASE_DIR",
+    "START_DIR",
+    "config",
 )
 
 # =============================================================================
@@ -50,12 +51,19 @@ _base_path = START_DIR / ".plugin_manager/files"
 PLUGIN_PRIMARY_FILES_DIR = _base_path / "plugin_primary_files"
 PLUGIN_REPO_ROOT_FILES_DIR = _base_path / "plugin_repo_root_files"
 CONDITIONAL_PYTHON_FILES_DIR = _base_path / "conditional_python_files"
+CACHE_DIR = START_DIR / ".plugin_manager/cache"
 
 LINK_BASE_DIR = Path(config["LINK_BASE_DIRECTORY"])
 RELEASE_DIR = Path(config["RELEASE_DIRECTORY"])
 
-# Get a list of all plugins
-PLUGIN_LIST = [
-    x.stem for x in START_DIR.dirs()
-    if not x.stem.startswith((".", "_"))
-]
+# Store the plugin base paths by their short name
+BASE_PATHS = {
+    "config": config["CONFIG_BASE_PATH"],
+    "data": config["DATA_BASE_PATH"],
+    "docs": config["DOCS_BASE_PATH"],
+    "events": config["EVENTS_BASE_PATH"],
+    "logs": config["LOGS_BASE_PATH"],
+    "plugin": config["PLUGIN_BASE_PATH"],
+    "sound": config["SOUND_BASE_PATH"],
+    "translations": config["TRANSLATIONS_BASE_PATH"],
+}
@@ -0,0 +1,319 @@
+# ../common/creation.py
+
+"""Provides functions to create a plugin with its base directories and files."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+
+# Site-package
+from git import Repo
+from github import Github
+from jinja2 import Template
+
+# Package
+from .constants import (
+    CONDITIONAL_PYTHON_FILES_DIR,
+    PLUGIN_PRIMARY_FILES_DIR,
+    PLUGIN_REPO_ROOT_FILES_DIR,
+    START_DIR,
+    config,
+)
+from .fs_snapshot import FileSystemSnapshot
+from .workspace import workspace
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "allowed_conditional_paths",
+    "create_github_repository",
+    "create_plugin",
+    "get_conditional_file_or_directory_data",
+    "get_conditional_paths_data",
+    "get_conditional_python_file_data",
+    "get_configuration_errors",
+    "get_default_repo_name",
+    "get_prefixed_plugin_name",
+    "is_valid_plugin_name",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+given_conditional_paths = config["CONDITIONAL_FILE_OR_DIRECTORY"]
+allowed_conditional_paths = {
+    "config": {
+        "path": config["CONFIG_BASE_PATH"],
+        "extension": "cfg",
+    },
+    "data": {
+        "path": config["DATA_BASE_PATH"],
+        "extension": "json",
+    },
+    "docs": {
+        "path": config["DOCS_BASE_PATH"],
+        "extension": "rst",
+    },
+    "events": {
+        "path": config["EVENTS_BASE_PATH"],
+        "extension": "res",
+    },
+    "logs": {
+        "path": config["LOGS_BASE_PATH"],
+        "extension": "log",
+    },
+    "sound": {
+        "path": config["SOUND_BASE_PATH"],
+        "extension": "md",
+    },
+    "translations": {
+        "path": config["TRANSLATIONS_BASE_PATH"],
+        "extension": "ini",
+    },
+}
+given_conditional_files = config["CONDITIONAL_PYTHON_FILES"]
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_configuration_errors():
+    """Return a message describing any invalid creation configuration."""
+    found_conditional_files = _get_found_conditional_files()
+    message = ""
+    diff = set(given_conditional_paths).difference(
+        allowed_conditional_paths,
+    )
+    if diff:
+        message += (
+            f"Invalid conditional files or directories in configuration:"
+            f"\n\t{', '.join(sorted(diff))}\n\n"
+        )
+    diff = set(found_conditional_files).difference(given_conditional_files)
+    if diff:
+        message += (
+            f"Conditional files found in directory, but not in "
+            f"configuration:\n\t{', '.join(sorted(diff))}\n\n"
+        )
+    diff = set(given_conditional_files).difference(found_conditional_files)
+    if diff:
+        message += (
+            f"Conditional files found in configuration, but not in "
+            f"directory:\n\t{', '.join(sorted(diff))}"
+        )
+    return message
+
+
+def is_valid_plugin_name(value):
+    """Return whether the value can be used as a plugin name."""
+    pattern = r"^[a-z][a-z0-9_]*$"
+    return re.fullmatch(pattern, value) is not None
+
+
+def get_prefixed_plugin_name(plugin_name):
+    """Return the plugin name with the configured PREFIX added."""
+    prefix = config["PREFIX"]
+    if prefix and not plugin_name.startswith(prefix):
+        return f"{prefix}_{plugin_name}"
+    return plugin_name
+
+
+def get_default_repo_name(plugin_name):
+    """Return the GitHub repository name suggested for the plugin."""
+    prefix = config["PREFIX"]
+    plugin_name = plugin_name.removeprefix(prefix)
+    repo_name = "".join(plugin_name.title().split("_"))
+    return f"{config['REPO_PREFIX']}{repo_name}"
+
+
+def get_conditional_python_file_data():
+    """Return the conditional python files the user can choose from."""
+    return [
+        f"{item}.py"
+        for item, values in config["CONDITIONAL_PYTHON_FILES"].items()
+        if values["always_create_file"] != "true" or (
+            values["always_create_file"] == "true" and
+            values["always_create_translations_file"] == "false" and
+            values["translations_file_path"]
+        )
+    ]
+
+
+def get_conditional_file_or_directory_data(plugin_name):
+    """Return the conditional files and directories to choose from."""
+    data = []
+    for item, value in config["CONDITIONAL_FILE_OR_DIRECTORY"].items():
+        values = allowed_conditional_paths[item]
+        base = f"{values['path']}/{plugin_name}"
+        if value in ("dir", "both"):
+            data.append(f"{base}/")
+        if value in ("file", "both"):
+            data.append(f"{base}.{values['extension']}")
+
+    return sorted(data)
+
+
+def get_conditional_paths_data(plugin_name):
+    """Yield the conditional paths to choose from."""
+    for value in config["CONDITIONAL_PATHS"].values():
+        yield value.format(plugin_name=plugin_name)
+
+
+def create_plugin(
+    plugin_name,
+    python_files=(),
+    translation_files=(),
+    paths=(),
+    repo_name=None,
+):
+    """Create the plugin and return its base path.
+
+    python_files and translation_files are the conditional python files
+    (as "name.py") to create, and to create translations files for.
+    Files configured to always be created are created regardless. paths
+    are the conditional files and directories to create, relative to the
+    plugin's base path. If repo_name is given, a git repository is
+    initialized and, with an access token, pushed to a new GitHub
+    repository of that name.
+    """
+    print(f"Creating plugin {plugin_name}")
+    snapshot = FileSystemSnapshot()
+    base_path = START_DIR / plugin_name
+    _create_root_files(base_path)
+    plugin_path = base_path / config["PLUGIN_BASE_PATH"] / plugin_name
+    _create_primary_files(plugin_name, plugin_path)
+    _create_conditional_python_files(
+        plugin_name,
+        base_path,
+        set(python_files),
+        set(translation_files),
+        snapshot,
+    )
+    for path in paths:
+        _create_directory_and_file(base_path / path, snapshot)
+    if repo_name is not None:
+        create_github_repository(base_path, repo_name)
+
+    workspace.add(plugin_name)
+    return base_path
+
+
+def create_github_repository(base_path, repo_name):
+    """Commit the plugin to a new repository, and push it to GitHub."""
+    repo = Repo.init(base_path, initial_branch="master")
+    for file in base_path.files():
+        repo.index.add(file.name)
+    repo.index.commit("Initial commit")
+    access_token = config["ACCESS_TOKEN"]
+    if not access_token:
+        return
+
+    github = Github(access_token)
+    user = github.get_user()
+    remote_url = user.create_repo(
+        repo_name,
+        private=False,
+        auto_init=False,
+    ).ssh_url
+    repo.create_remote("origin", url=remote_url)
+    repo.git.push("--set-upstream", "origin", "master")
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_found_conditional_files():
+    # The directory only exists once the creator's templates are set up
+    if not CONDITIONAL_PYTHON_FILES_DIR.is_dir():
+        return []
+    return [
+        str(item.stem) for item in CONDITIONAL_PYTHON_FILES_DIR.files()
+        if item.name != "delete.me"
+    ]
+
+
+def _create_root_files(base_path):
+    base_path.makedirs()
+    for file in PLUGIN_REPO_ROOT_FILES_DIR.files():
+        if file.name == "delete.me":
+            continue
+        file.copy(
+            base_path / file.name,
+        )
+
+
+def _create_primary_files(plugin_name, plugin_path):
+    plugin_path.makedirs()
+    for file in PLUGIN_PRIMARY_FILES_DIR.files():
+        if file.name == "delete.me":
+            continue
+        new_file = plugin_path / file.name
+        _copy_and_format_file(
+            plugin_name=plugin_name,
+            file=file,
+            new_file=new_file,
+        )
+
+
+def _create_conditional_python_files(
+    plugin_name,
+    base_path,
+    python_files,
+    translation_files,
+    snapshot,
+):
+    plugin_path = base_path / config["PLUGIN_BASE_PATH"] / plugin_name
+    for item, values in config["CONDITIONAL_PYTHON_FILES"].items():
+        key = f"{item}.py"
+        if key not in python_files and values["always_create_file"] != "true":
+            continue
+        file = CONDITIONAL_PYTHON_FILES_DIR / key
+        new_file = plugin_path / file.name
+        _copy_and_format_file(
+            plugin_name=plugin_name,
+            file=file,
+            new_file=new_file,
+        )
+        path = values.get("translations_file_path")
+        if not path:
+            continue
+
+        always = values.get("always_create_translations_file") == "true"
+        if not always and key not in translation_files:
+            continue
+
+        path = path.format(plugin_name=plugin_name)
+        path = base_path / config["TRANSLATIONS_BASE_PATH"] / path
+        _create_directory_and_file(path, snapshot)
+
+
+def _copy_and_format_file(plugin_name, file, new_file):
+    if file.stem == "plugin":
+        new_file = new_file.with_stem(plugin_name)
+    with file.open() as open_file:
+        file_contents = Template(open_file.read())
+
+    file_contents = file_contents.render(
+        plugin_name=plugin_name,
+        plugin_prefix="".join(
+            [i[0] for i in plugin_name.split("_")],
+        ) + "_",
+        author=config["AUTHOR"],
+    )
+    if not file_contents.endswith("\n"):
+        file_contents += "\n"
+    with new_file.open("w") as open_file:
+        open_file.write(file_contents)
+
+
+def _create_directory_and_file(path, snapshot):
+    directory = path
+    if path.suffix:
+        directory = path.parent
+    snapshot.makedirs(directory)
+    if path.suffix:
+        snapshot.touch(path)
@@ -0,0 +1,142 @@
+# ../common/fs_snapshot.py
+
+"""Provides a snapshot of directory listings to avoid repeated stat calls.
+
+Each directory is read with a single os.scandir the first time anything
+in it is looked up, and later lookups are answered from that listing.
+A snapshot is meant to last for a single operation, and writes made
+through it invalidate the listings they change. One snapshot can be
+shared by several threads.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+import threading
+
+# Site-package
+from path import Path
+
+# Package
+from .functions import normalize_path
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "FileSystemSnapshot",
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class FileSystemSnapshot(dict):
+    """Maps each normalized directory path to its {name: os.DirEntry}.
+
+    The entries cache their own is_dir/is_file results, so looking up a
+    path usually costs no system calls at all once its directory has been
+    read. Missing or unreadable directories are stored as empty listings.
+
+    Directories are read outside of the lock, so threads can read several
+    at once. A listing read while a write invalidated listings is returned
+    but not stored, as it might be missing the written entry.
+    """
+
+    def __init__(self):
+        """Create an empty snapshot, which reads directories as needed."""
+        super().__init__()
+        self.lock = threading.Lock()
+        self.generation = 0
+
+    def scan(self, directory):
+        """Return the directory's {name: os.DirEntry}, reading it once."""
+        key = normalize_path(directory)
+        with self.lock:
+            entries = self.get(key)
+            generation = self.generation
+        if entries is not None:
+            return entries
+
+        try:
+            with os.scandir(directory) as iterator:
+                entries = {entry.name: entry for entry in iterator}
+        except OSError:
+            entries = {}
+        with self.lock:
+            if generation == self.generation:
+                self[key] = entries
+        return entries
+
+    def get_entry(self, path):
+        """Return the os.DirEntry for the path, or None if it is missing."""
+        directory, name = os.path.split(os.path.normpath(path))
+        return self.scan(directory).get(name)
+
+    def exists(self, path):
+        """Return whether anything exists at the path."""
+        return self.get_entry(path) is not None
+
+    def is_dir(self, path):
+        """Return whether the path is a directory, or links to one."""
+        entry = self.get_entry(path)
+        return entry is not None and entry.is_dir()
+
+    def is_file(self, path):
+        """Return whether the path is a file, or links to one."""
+        entry = self.get_entry(path)
+        return entry is not None and entry.is_file()
+
+    def dirs(self, directory):
+        """Return the paths of the directory's subdirectories."""
+        return [
+            Path(entry.path) for entry in self.scan(directory).values()
+            if entry.is_dir()
+        ]
+
+    def files(self, directory):
+        """Return the paths of the directory's files."""
+        return [
+            Path(entry.path) for entry in self.scan(directory).values()
+            if entry.is_file()
+        ]
+
+    def invalidate(self, path):
+        """Forget the listings changed by writing to the given path.
+
+        That is the path's own listing, if it is a directory, and the
+        listing of its parent, which might have gained a new entry.
+        """
+        path = normalize_path(path)
+        with self.lock:
+            self.generation += 1
+            self.pop(path, None)
+            self.pop(str(Path(path).parent), None)
+
+    def makedirs(self, path):
+        """Create the directory and any missing parents."""
+        path = os.path.normpath(path)
+        created = []
+        while not self.is_dir(path):
+            created.append(path)
+            parent = str(Path(path).parent)
+            if parent == path:
+                break
+            path = parent
+
+        if not created:
+            return
+
+        Path(created[0]).makedirs_p()
+        for directory in created:
+            self.invalidate(directory)
+
+    def touch(self, path):
+        """Create the file if it does not exist."""
+        if self.exists(path):
+            return
+
+        Path(path).touch()
+        self.invalidate(path)
@@ -5,15 +5,27 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
+# Python
+import hashlib
+import os
+from pathlib import Path, PurePath
+
 # Package
-from .constants import PLATFORM
+from .constants import PLATFORM, START_DIR, config
 
 # =============================================================================
 # >> ALL
 # =============================================================================
 __all__ = (
-    'get_link_directory_command',
-    'get_link_file_command',
+    "get_copy_file_command",
+    "get_file_hash",
+    "get_link_directory_command",
+    "get_link_file_command",
+    "get_make_directory_command",
+    "get_plugin_check_path",
+    "get_plugin_name",
+    "get_remove_link_command",
+    "normalize_path",
 )
 
 
@@ -36,3 +48,72 @@ def get_link_file_command(src, dest):
 
     else:
         return f'ln -s "{src}" "{dest}"'
+
+
+def get_make_directory_command(dest):
+    """Create the directory and any missing parents."""
+    if PLATFORM == "windows":
+        return f'mkdir "{dest}"'
+
+    return f'mkdir -p "{dest}"'
+
+
+def get_copy_file_command(src, dest):
+    """Copy the file to the given destination."""
+    if PLATFORM == "windows":
+        return f'cmd /c copy "{src}" "{dest}"'
+
+    return f'cp "{src}" "{dest}"'
+
+
+def get_remove_link_command(kind, dest):
+    """Remove the link at the given destination, but not what it links to."""
+    if PLATFORM == "windows":
+        if kind == "directory":
+            return f'rmdir "{dest}"'
+
+        return f'cmd /c del "{dest}"'
+
+    return f'rm "{dest}"'
+
+
+def get_plugin_check_path(plugin_name):
+    """Return the path to the plugin's primary directory."""
+    return START_DIR.joinpath(
+        plugin_name,
+        config["PLUGIN_BASE_PATH"],
+        plugin_name,
+    )
+
+
+def get_plugin_name(filename):
+    """Return the name of the plugin the given file belongs to."""
+    return PurePath(filename).relative_to(START_DIR).parts[0]
+
+
+def get_file_hash(path, file_hashes=None):
+    """Return the sha256 hash of the file's contents.
+
+    file_hashes, if given, is a ResultCache used to avoid re-reading files
+    whose mtime and size have not changed.
+    """
+    stat = Path(path).stat()
+    key = f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+    if file_hashes is not None:
+        value = file_hashes.get(key)
+        if value is not None:
+            return value
+
+    value = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    if file_hashes is not None:
+        file_hashes.set(key, value)
+    return value
+
+
+def normalize_path(path):
+    """Return the path in a form that can be compared to other paths."""
+    path = str(path)
+
+    # Windows junction targets are read with this prefix
+    path = path.removeprefix("\\\\?\\")
+    return os.path.normcase(os.path.normpath(path))
@@ -0,0 +1,192 @@
+# ../common/git_sync.py
+
+"""Provides functions for syncing the workspace's plugin repositories."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Package
+from .constants import config
+from .scheduler import RESOURCE_LIMITS
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "SYNC_WORKERS",
+    "format_sync_table",
+    "get_failed_result",
+    "sync_repositories",
+    "sync_repository",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+SYNC_WORKERS = int(config.get("SYNC_WORKERS") or RESOURCE_LIMITS["git"])
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def sync_repository(name, path, *, fast_forward=False):
+    """Fetch the repository and return its state compared to upstream.
+
+    A branch without an upstream is fetched and checked for changes, but
+    has no ahead/behind counts and its result's upstream is False.
+    """
+    start = time.perf_counter()
+    result = _get_result(name)
+    try:
+        _git(path, "fetch", "--prune", "--quiet")
+        result["dirty"] = bool(_git(path, "status", "--porcelain"))
+        result["upstream"] = _has_upstream(path)
+        if not result["upstream"]:
+            result["duration"] = time.perf_counter() - start
+            return result
+
+        ahead, behind = _git(
+            path, "rev-list", "--left-right", "--count", "HEAD...@{u}",
+        ).split()
+        result["ahead"] = int(ahead)
+        result["behind"] = int(behind)
+        if fast_forward and result["behind"] and not result["ahead"]:
+            _git(path, "merge", "--ff-only", "--quiet", "@{u}")
+            result["fast_forwarded"] = True
+            result["behind"] = 0
+    except subprocess.CalledProcessError as error:
+        lines = (error.stderr or "").strip().splitlines()
+        result["error"] = (
+            lines[-1] if lines else f"exit code {error.returncode}"
+        )
+    except OSError as error:
+        result["error"] = str(error)
+    result["duration"] = time.perf_counter() - start
+    return result
+
+
+def get_failed_result(name, error):
+    """Return a result for a repository whose sync never returned one."""
+    result = _get_result(name)
+    result["error"] = str(error)
+    return result
+
+
+def sync_repositories(
+    repos,
+    *,
+    fast_forward=False,
+    max_workers=SYNC_WORKERS,
+    on_result=None,
+):
+    """Sync the given {name: path} repositories in parallel.
+
+    on_result is called with each result as soon as it completes.
+    Returns the results sorted by name.
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(
+                sync_repository,
+                name,
+                path,
+                fast_forward=fast_forward,
+            )
+            for name, path in repos.items()
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return sorted(results, key=lambda item: item["name"])
+
+
+def format_sync_table(results):
+    """Return the lines of a table showing the given sync results."""
+    headers = ("Plugin", "Ahead", "Behind", "Dirty", "Time", "Status")
+    rows = []
+    for result in results:
+        if result["error"] is not None:
+            status = f"FAILED: {result['error']}"
+        elif result["upstream"] is False:
+            status = "no upstream"
+        elif result["fast_forwarded"]:
+            status = "fast-forwarded"
+        else:
+            status = "ok"
+        rows.append((
+            result["name"],
+            _format_count(result["ahead"]),
+            _format_count(result["behind"]),
+            {None: "-", True: "yes", False: "no"}[result["dirty"]],
+            f"{result['duration']:.1f}s",
+            status,
+        ))
+    widths = [
+        max(len(row[i]) for row in [headers, *rows])
+        for i in range(len(headers) - 1)
+    ]
+    lines = [
+        "  ".join([
+            *(
+                value.ljust(width)
+                for value, width in zip(row[:-1], widths, strict=True)
+            ),
+            row[-1],
+        ])
+        for row in [headers, *rows]
+    ]
+    failures = sum(result["error"] is not None for result in results)
+    skipped = sum(result["upstream"] is False for result in results)
+    lines.append("")
+    lines.append(
+        f"Synced {len(results) - failures - skipped} of {len(results)} repos.",
+    )
+    if skipped:
+        lines.append(f"Skipped {skipped} without an upstream branch.")
+    return lines
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_result(name):
+    return {
+        "name": name,
+        "upstream": None,
+        "ahead": None,
+        "behind": None,
+        "dirty": None,
+        "fast_forwarded": False,
+        "error": None,
+        "duration": 0.0,
+    }
+
+
+def _git(path, *args):
+    return subprocess.run(
+        ["git", "-C", str(path), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def _has_upstream(path):
+    return not subprocess.run(
+        ["git", "-C", str(path), "rev-parse", "--verify", "--quiet", "@{u}"],
+        capture_output=True,
+        check=False,
+    ).returncode
+
+
+def _format_count(value):
+    return "-" if value is None else str(value)
@@ -0,0 +1,181 @@
+# ../common/github_client.py
+
+"""Provides a GitHub API client for retrieving repository listings."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# Site-Package
+import requests
+from requests.adapters import HTTPAdapter
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "API_URL",
+    "PER_PAGE",
+    "GitHubClient",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+API_URL = "https://api.github.com"
+
+# GitHub's maximum page size
+PER_PAGE = 100
+MAX_WORKERS = 8
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class GitHubClient:
+    """Retrieves repository listings for users and organizations.
+
+    The first page for every owner is requested concurrently. Once the
+    Link header gives the number of pages, the remaining pages are all
+    requested concurrently as well, sharing one connection pool.
+
+    When given an HTTPCache, requests are sent conditionally and a 304
+    response is answered from the cached body. Passing force=True skips
+    the conditional headers so every page is downloaded again.
+    """
+
+    def __init__(
+        self,
+        base_url=API_URL,
+        token=None,
+        max_workers=MAX_WORKERS,
+        cache=None,
+        *,
+        force=False,
+    ):
+        """Create the client and its connection pool."""
+        self.base_url = base_url.rstrip("/")
+        self.max_workers = max_workers
+        self.cache = cache
+        self.force = force
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "PluginManager",
+        })
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def get_user_repos_url(self, user):
+        """Return the url listing the user's repositories."""
+        return f"{self.base_url}/users/{user}/repos"
+
+    def get_org_repos_url(self, org):
+        """Return the url listing the organization's repositories."""
+        return f"{self.base_url}/orgs/{org}/repos"
+
+    def get_search_url(self):
+        """Return the url of the repository search."""
+        return f"{self.base_url}/search/repositories"
+
+    def get_page(self, url, page, params=None):
+        """Return the items and page count of a page, or None on error."""
+        params = {**(params or {}), "per_page": PER_PAGE, "page": page}
+        current_url = f"{url}?{urlencode(params)}"
+        entry = None
+        if self.cache is not None and not self.force:
+            entry = self.cache.get(current_url)
+
+        headers = {} if entry is None else self.cache.get_headers(entry)
+        response = self.session.get(url=current_url, headers=headers)
+        if (
+            response.status_code == HTTPStatus.NOT_MODIFIED and
+            entry is not None
+        ):
+            self.cache.touch(current_url, entry)
+            return entry["body"], _get_last_page(entry["links"])
+
+        if response.status_code != HTTPStatus.OK:
+            print(
+                f"Error retrieving plugin list for {current_url}:"
+                f" {response.status_code}",
+            )
+            return None
+
+        body = response.json()
+        if self.cache is not None:
+            self.cache.store(current_url, response, body)
+        links = {
+            rel: values["url"] for rel, values in response.links.items()
+        }
+        return body, _get_last_page(links)
+
+    def get_all_pages(self, urls, params=None, items_key=None):
+        """Return the combined items of every page for each of the urls."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            first_pages = list(
+                executor.map(lambda url: self.get_page(url, 1, params), urls),
+            )
+            remaining = [
+                (url, page, params)
+                for url, result in zip(urls, first_pages, strict=True)
+                if result is not None
+                for page in range(2, result[1] + 1)
+            ]
+            other_pages = executor.map(
+                lambda args: self.get_page(*args),
+                remaining,
+            )
+            items = []
+            for result in [*first_pages, *other_pages]:
+                if result is None:
+                    continue
+                body = result[0]
+                items.extend(body if items_key is None else body[items_key])
+
+        if self.cache is not None:
+            self.cache.evict()
+        return items
+
+    def list_repositories(self, users=(), orgs=()):
+        """Return every repository owned by the given users/organizations."""
+        urls = [
+            *map(self.get_user_repos_url, users),
+            *map(self.get_org_repos_url, orgs),
+        ]
+        return self.get_all_pages(urls)
+
+    def search_repositories(self, query):
+        """Return every repository matching the given search query.
+
+        GitHub only returns the first 1000 results of a search.
+        """
+        return self.get_all_pages(
+            urls=[self.get_search_url()],
+            params={"q": query},
+            items_key="items",
+        )
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_last_page(links):
+    last = links.get("last")
+    if last is None:
+        return 1
+    pages = parse_qs(urlsplit(last).query).get("page")
+    if not pages:
+        return 1
+    return int(pages[0])
@@ -0,0 +1,125 @@
+# ../common/http_cache.py
+
+"""Provides an on-disk cache for conditional HTTP requests."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "HTTPCache",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Entries older than this are discarded and downloaded in full again
+MAX_AGE = 30 * 24 * 60 * 60
+
+# Once the cache exceeds this many bytes, the oldest entries are discarded
+MAX_SIZE = 50 * 1024 * 1024
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class HTTPCache:
+    """Stores response bodies with their ETag and Last-Modified values.
+
+    Each url is stored in its own file, so entries can be read and written
+    from several threads at once.
+    """
+
+    def __init__(self, directory, max_age=MAX_AGE, max_size=MAX_SIZE):
+        """Create the cache storing its entries in the directory."""
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_size = max_size
+
+    def get_path(self, url):
+        """Return the path of the file storing the url's entry."""
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return self.directory / f"{name}.json"
+
+    def get(self, url):
+        """Return the stored entry for the url, or None if there is none."""
+        with suppress(OSError, ValueError):
+            entry = json.loads(self.get_path(url).read_text())
+            if time.time() - entry["stored"] <= self.max_age:
+                return entry
+        return None
+
+    def get_headers(self, entry):
+        """Return the conditional request headers for the given entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, response, body):
+        """Store the body of the given response for the url."""
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "links": {
+                rel: values["url"] for rel, values in response.links.items()
+            },
+            "body": body,
+            "stored": time.time(),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(url)
+        temp_path = path.with_suffix(
+            f".{os.getpid()}-{threading.get_ident()}.tmp",
+        )
+        temp_path.write_text(json.dumps(entry))
+        temp_path.replace(path)
+        return entry
+
+    def touch(self, url, entry):
+        """Mark the entry as fresh after the server confirmed it with a 304."""
+        entry["stored"] = time.time()
+        with suppress(OSError):
+            self.get_path(url).write_text(json.dumps(entry))
+
+    def evict(self):
+        """Remove expired entries, then the oldest ones while over size."""
+        try:
+            files = [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".json")
+            ]
+        except OSError:
+            return
+
+        now = time.time()
+        total = 0
+        for mtime, size, path in sorted(files, reverse=True):
+            total += size
+            if now - mtime > self.max_age or total > self.max_size:
+                with suppress(OSError):
+                    Path(path).unlink()
+
+    def clear(self):
+        """Remove every stored entry."""
+        with suppress(OSError):
+            for path in self.directory.glob("*.json"):
+                path.unlink()
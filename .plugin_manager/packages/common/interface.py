@@ -2,37 +2,59 @@
 # >> IMPORTS
 # =============================================================================
 # Python
-import subprocess
+import queue
 import sys
 import tkinter as tk
+import traceback
+
+# Package
+from .console import Console
+from .jobs_panel import JobsPanel
+from .link_manifest import (
+    format_verify_result,
+    get_repair_operations,
+    get_unlink_operations,
+    link_manifest,
+)
+from .links import apply_link_operations, format_link_result
+from .picker import Picker
+from .runner import CommandRunner
+from .scheduler import scheduler
 
 # =============================================================================
 # >> ALL
 # =============================================================================
 __all__ = (
-    'BaseInterface',
+    "SCREEN_PREFIX",
+    "BaseInterface",
+    "lift_persistent_widgets",
 )
 
 
 # =============================================================================
 # >> GLOBAL VARIABLES
 # =============================================================================
-BUTTONS_PER_ROW = 4
+# Milliseconds between reads of a background job's output
+POLL_INTERVAL = 50
+
+# Names of the widgets that stay on the window between screens
+PERSISTENT_WIDGETS = ("jobs_panel", "jobs_window")
+
+# Cached screen frames are named with this prefix, so they are hidden
+#   instead of destroyed when the screen changes
+SCREEN_PREFIX = "screen_"
 
 
 # =============================================================================
 # >> CLASSES
 # =============================================================================
 class TextRedirector:
-    def __init__(self, text_widget, tag="stdout"):
-        self.text_widget = text_widget
+    def __init__(self, console, tag="stdout"):
+        self.console = console
         self.tag = tag
 
     def write(self, message):
-        self.text_widget.configure(state="normal")
-        self.text_widget.insert("end", message, (self.tag,))
-        self.text_widget.see("end")
-        self.text_widget.configure(state="disabled")
+        self.console.write(message, self.tag)
 
     def flush(self):
         pass  # Needed for compatibility with some streams
@@ -41,17 +63,25 @@ class TextRedirector:
 class BaseInterface:
 
     name = None
+    scheduler = scheduler
     stdout = None
     stderr = None
 
     def __init__(self, window, main_run):
         self.window = window
         self.main_run = main_run
+        self.screens = {}
 
     def clear_grid(self):
+        """Hide the cached screens and destroy every other screen's widgets."""
         for widget in self.window.winfo_children():
             if isinstance(widget, tk.Button) and widget.cget("text") == "Exit":
                 continue
+            if widget.winfo_name() in PERSISTENT_WIDGETS:
+                continue
+            if widget.winfo_name().startswith(SCREEN_PREFIX):
+                widget.place_forget()
+                continue
             widget.destroy()
         if self.stdout is None:
             return
@@ -61,26 +91,47 @@ class BaseInterface:
         self.stdout = None
         self.stderr = None
 
-    def create_grid(self, data):
-        for i, label in enumerate(data):
-            row = i // BUTTONS_PER_ROW
-            col = i % BUTTONS_PER_ROW
-            button = tk.Button(
+    def show_screen(self, key, build, update=None):
+        """Show the screen's cached frame, building it on first use.
+
+        build is called with the new frame to create its widgets, and
+        update, if given, is called with the frame every time it is shown,
+        so only the data that can change needs to be refreshed.
+        """
+        self.clear_grid()
+        frame = self.screens.get(key)
+        if frame is None or not frame.winfo_exists():
+            frame = self.screens[key] = tk.Frame(
                 self.window,
-                text=label,
-                command=lambda l=label: self.on_click(l),
+                name=f"{SCREEN_PREFIX}{self.__module__}_{key}",
             )
-            button.grid(row=row, column=col, padx=10, pady=10, sticky="ew")
+            build(frame)
+        frame.place(x=0, y=0, relwidth=1, relheight=1)
+        frame.tkraise()
+        lift_persistent_widgets(self.window)
+        if update is not None:
+            update(frame)
+        return frame
 
-        for i in range(BUTTONS_PER_ROW):
-            self.window.grid_columnconfigure(i, weight=1)
+    def create_picker(self, data, actions=None, parent=None):
+        """Show a filterable list of the data that calls on_click.
 
-        for i in range((len(data) + BUTTONS_PER_ROW - 1) // BUTTONS_PER_ROW):
-            self.window.grid_rowconfigure(i, weight=1)
+        actions ({label: callback}) enable multi-select, with a button for
+        each action that calls its callback with the selected names.
+        """
+        picker = Picker(
+            parent or self.window,
+            items=data,
+            on_activate=self.on_click,
+            actions=actions,
+        )
+        picker.place(x=10, y=10, relwidth=1, width=-20, relheight=1, height=-60)
+        return picker
 
-    def add_back_button(self, command):
+    def add_back_button(self, command, parent=None):
+        """Add a Back button calling command to parent or the window."""
         back_button = tk.Button(
-            self.window,
+            parent or self.window,
             text="Back",
             command=command,
         )
@@ -95,28 +146,277 @@ class BaseInterface:
         self.window.rowconfigure(1, weight=1)
         self.window.rowconfigure(2, weight=1)
         self.window.columnconfigure(0, weight=1)
-        console = tk.Text(self.window, wrap="word", font=("consolas", 10))
+        console = Console(self.window)
         console.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        console.tag_config("stdout", foreground="black")
-        console.tag_config("stderr", foreground="red")
         self.stdout = sys.stdout
         self.stderr = sys.stderr
         sys.stdout = TextRedirector(console, "stdout")
         sys.stderr = TextRedirector(console, "stderr")
         return console
 
-    @staticmethod
-    def execute_console_commands(console, commands):
-        process = subprocess.Popen(
-            " && ".join(commands),
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
+    def execute_console_commands(
+        self,
+        console,
+        commands,
+        on_complete=None,
+        resource="cpu",
+    ):
+        """Run the commands as a job, writing output to the console.
+
+        The commands stop at the first failure, like joining them with &&.
+        on_complete is called with the CommandRunner once it finishes, even
+        if the console has been closed by then.
+        """
+        runner = CommandRunner(commands)
+        job = self.submit_job(
+            f"Run {len(runner.commands)} command(s)",
+            runner.run,
+            resource=resource,
+        )
+        cancel_button = tk.Button(
+            self.window,
+            text="Cancel",
+            command=lambda: self.cancel_runner(runner, job),
+        )
+        cancel_button.place(x=70, y=730)
+        self.window.after(
+            POLL_INTERVAL,
+            lambda: self._drain_runner(
+                console,
+                runner,
+                job,
+                cancel_button,
+                on_complete,
+            ),
+        )
+        return runner
+
+    def cancel_runner(self, runner, job):
+        """Stop the runner, or keep its job from starting if still queued."""
+        runner.cancel()
+        self.scheduler.cancel(job)
+
+    def _drain_runner(self, console, runner, job, cancel_button, on_complete):
+        # Read whether the runner is done first, so no output is missed, and
+        #   a job cancelled before it started never runs the runner at all
+        done = runner.done.is_set() or job.status == "cancelled"
+        lines = []
+        while True:
+            try:
+                lines.append(runner.output.get_nowait())
+            except queue.Empty:
+                break
+
+        if done:
+            lines.extend(
+                f"[exit code {result['returncode']} after "
+                f"{result['duration']:.1f}s] {result['command']}\n"
+                for result in runner.results
+            )
+            if runner.cancelled:
+                lines.append("[cancelled]\n")
+
+        if lines and console.winfo_exists():
+            console.write("".join(lines))
+
+        if not done:
+            self.window.after(
+                POLL_INTERVAL,
+                lambda: self._drain_runner(
+                    console,
+                    runner,
+                    job,
+                    cancel_button,
+                    on_complete,
+                ),
+            )
+            return
+
+        if cancel_button.winfo_exists():
+            cancel_button.destroy()
+        if on_complete is not None:
+            on_complete(runner)
+
+    def execute_link_operations(
+        self,
+        console,
+        operations,
+        *,
+        dry_run=False,
+        on_complete=None,
+    ):
+        """Create the links in the background, writing results to the console.
+
+        on_complete is called with the list of results once all of the
+        operations have been applied.
+        """
+        operations = list(operations)
+        if not operations:
+            console.write("Nothing to link.\n")
+
+        def on_results(results):
+            for result in results:
+                console.write(
+                    f"{format_link_result(result)}\n",
+                    "stdout" if result["error"] is None else "stderr",
+                )
+
+        def on_finished(results):
+            failures = sum(result["error"] is not None for result in results)
+            if operations and not dry_run:
+                console.write(
+                    f"Applied {len(results) - failures} of {len(results)}"
+                    f" link operations.\n",
+                )
+            if on_complete is not None:
+                on_complete(results)
+
+        def apply():
+            results = apply_link_operations(
+                operations,
+                dry_run=dry_run,
+                on_results=on_results,
+            )
+            link_manifest.record(results)
+            return results
+
+        self.run_in_background(
+            apply,
+            on_finished,
+            name="Link",
+            resource="disk",
+        )
+
+    def execute_manifest_action(
+        self,
+        console,
+        action,
+        owner_type,
+        names,
+        *,
+        dry_run=False,
+    ):
+        """Verify the owners' recorded links, and repair or unlink them.
+
+        action is "verify", "repair" or "unlink". Only the paths recorded
+        in the link manifest are checked.
+        """
+        def on_verified(results):
+            if not console.winfo_exists():
+                return
+
+            if not results:
+                console.write(
+                    f"No links are recorded for: {', '.join(names)}\n",
+                )
+            for result in results:
+                console.write(
+                    f"{format_verify_result(result)}\n",
+                    "stdout" if result["status"] == "ok" else "stderr",
+                )
+            if action == "verify":
+                return
+
+            if action == "repair":
+                operations = get_repair_operations(results)
+            else:
+                operations = get_unlink_operations(results)
+                if not dry_run:
+                    link_manifest.forget(
+                        result["dest"] for result in results
+                        if result["status"] not in ("ok", "dangling")
+                    )
+            self.execute_link_operations(
+                console=console,
+                operations=operations,
+                dry_run=dry_run,
+            )
+
+        self.run_in_background(
+            lambda: link_manifest.verify(owner_type, names),
+            on_verified,
+            name="Verify links",
+            resource="disk",
+        )
+
+    def get_jobs_panel(self):
+        """Return the window's jobs panel, creating it if needed."""
+        panel = self.window.children.get("jobs_panel")
+        if panel is None:
+            panel = JobsPanel(self.window, self.scheduler, name="jobs_panel")
+            panel.place(x=300, y=733)
+        return panel
+
+    def submit_job(
+        self,
+        name,
+        function,
+        resource="cpu",
+        depends_on=(),
+        on_complete=None,
+    ):
+        """Submit the function to the scheduler and return its Job.
+
+        on_complete, if given, is called with the Job on the Tk thread
+        once it has finished.
+        """
+        self.get_jobs_panel()
+        job = self.scheduler.submit(name, function, resource, depends_on)
+        if on_complete is not None:
+            self.wait_for_jobs([job], lambda _: on_complete(job))
+        return job
+
+    def wait_for_jobs(self, jobs, on_complete):
+        """Call on_complete with the jobs on the Tk thread once all finish."""
+        def poll():
+            if not all(job.done.is_set() for job in jobs):
+                self.window.after(POLL_INTERVAL, poll)
+                return
+            on_complete(jobs)
+
+        self.window.after(POLL_INTERVAL, poll)
+
+    def run_in_background(
+        self,
+        function,
+        on_complete,
+        name="Background task",
+        resource="cpu",
+    ):
+        """Run the function as a job and pass its result to on_complete.
+
+        on_complete is called on the Tk thread. If the function raises,
+        the traceback is printed instead.
+        """
+        def on_job_complete(job):
+            if job.error is not None:
+                traceback.print_exception(job.error)
+                return
+            if job.status == "done":
+                on_complete(job.result)
+
+        return self.submit_job(
+            name,
+            function,
+            resource,
+            on_complete=on_job_complete,
         )
-        for line in process.stdout:
-            console.insert("end", line)
 
     @staticmethod
     def on_click(option):
         raise NotImplementedError()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def lift_persistent_widgets(window):
+    """Keep the Exit button and jobs panel above a newly raised screen."""
+    for widget in window.winfo_children():
+        if isinstance(widget, tk.Toplevel):
+            continue
+        if (
+            widget.winfo_name() in PERSISTENT_WIDGETS or
+            (isinstance(widget, tk.Button) and widget.cget("text") == "Exit")
+        ):
+            widget.lift()
@@ -0,0 +1,112 @@
+# ../common/jobs_panel.py
+
+"""Provides a panel that shows the scheduler's jobs on every screen."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import tkinter as tk
+from tkinter import ttk
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "JobsPanel",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Milliseconds between refreshes of the panel
+REFRESH_INTERVAL = 250
+
+_active_statuses = ("running", "queued", "waiting")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class JobsPanel(tk.Frame):
+    """A one line summary of the scheduler's jobs, with a details window."""
+
+    def __init__(self, master, scheduler, **kwargs):
+        """Create the panel showing the jobs of the scheduler."""
+        super().__init__(master, **kwargs)
+        self.scheduler = scheduler
+        self.tree = None
+        self.label = tk.Label(self, anchor="w", width=50)
+        self.label.pack(side="left")
+        details_button = tk.Button(self, text="Jobs", command=self.show_jobs)
+        details_button.pack(side="left")
+        self.refresh()
+
+    def refresh(self):
+        """Update the summary, and the details window if it is open."""
+        counts = self.scheduler.get_counts()
+        active = ", ".join(
+            f"{counts[status]} {status}"
+            for status in _active_statuses
+            if counts[status]
+        )
+        self.label.configure(text=f"Jobs: {active or 'idle'}")
+        if self.tree is not None and self.tree.winfo_exists():
+            self.populate_jobs()
+        self.after(REFRESH_INTERVAL, self.refresh)
+
+    def show_jobs(self):
+        """Open the details window, or raise it if it is already open."""
+        if self.tree is not None and self.tree.winfo_exists():
+            self.tree.winfo_toplevel().lift()
+            return
+
+        window = tk.Toplevel(self.master, name="jobs_window")
+        window.title("Jobs")
+        window.geometry("700x400")
+        scrollbar = tk.Scrollbar(window)
+        scrollbar.pack(side="right", fill="y")
+        self.tree = ttk.Treeview(
+            window,
+            columns=("resource", "status", "duration", "error"),
+            yscrollcommand=scrollbar.set,
+        )
+        self.tree.heading("#0", text="Job")
+        self.tree.heading("resource", text="Resource")
+        self.tree.heading("status", text="Status")
+        self.tree.heading("duration", text="Duration")
+        self.tree.heading("error", text="Error")
+        self.tree.column("#0", width=250)
+        self.tree.column("resource", width=70)
+        self.tree.column("status", width=70)
+        self.tree.column("duration", width=70, anchor="e")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.configure(command=self.tree.yview)
+        self.populate_jobs()
+
+    def populate_jobs(self):
+        """Update the details window's rows to match the jobs."""
+        jobs = {str(job.id): job for job in self.scheduler.jobs}
+        for item in self.tree.get_children():
+            if item not in jobs:
+                self.tree.delete(item)
+
+        for item, job in jobs.items():
+            duration = job.duration
+            values = (
+                job.resource,
+                job.status,
+                "" if duration is None else f"{duration:.1f}s",
+                "" if job.error is None else str(job.error),
+            )
+            if self.tree.exists(item):
+                self.tree.item(item, values=values)
+            else:
+                self.tree.insert(
+                    "",
+                    "end",
+                    iid=item,
+                    text=job.name,
+                    values=values,
+                )
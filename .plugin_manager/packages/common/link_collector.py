@@ -0,0 +1,146 @@
+# ../common/link_collector.py
+
+"""Finds and removes dangling links left behind in the link directories.
+
+Links into the workspace or the Source.Python repository stop working
+when a plugin is deleted or renamed, or the repository is moved. The
+directory trees are walked in parallel, one os.scandir per directory,
+without following any links.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path, PurePath
+
+# Package
+from .constants import LINK_BASE_DIR, START_DIR
+from .functions import normalize_path
+from .link_manifest import link_manifest
+from .links import (
+    apply_link_operations,
+    get_entry_link_target,
+    get_remove_operation,
+)
+from .scheduler import RESOURCE_LIMITS
+from .source_python import SOURCE_PYTHON_DIR
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "COLLECT_WORKERS",
+    "find_dangling_links",
+    "get_collect_roots",
+    "remove_dangling_links",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+COLLECT_WORKERS = RESOURCE_LIMITS["disk"]
+
+# Dangling links from Source.Python are grouped under this name
+SOURCE_PYTHON_OWNER = "Source.Python"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_collect_roots(games):
+    """Return LINK_BASE_DIR and the directories of the given games.
+
+    games is the value returned by get_supported_games.
+    """
+    return [LINK_BASE_DIR, *(values["directory"] for values in games.values())]
+
+
+def find_dangling_links(roots, max_workers=COLLECT_WORKERS):
+    """Return the remove operations for dangling links under the roots.
+
+    Only links into the workspace or the Source.Python repository are
+    included. Each operation's owner is the plugin the link pointed into,
+    or Source.Python.
+    """
+    owners = {
+        normalize_path(START_DIR) + os.sep: None,
+        normalize_path(SOURCE_PYTHON_DIR) + os.sep: SOURCE_PYTHON_OWNER,
+    }
+    operations = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = {
+            executor.submit(_scan_directory, root, owners)
+            for root in {normalize_path(root): root for root in roots}.values()
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directories, dangling = future.result()
+                operations.extend(dangling)
+                pending.update(
+                    executor.submit(_scan_directory, directory, owners)
+                    for directory in directories
+                )
+
+    return sorted(operations, key=lambda operation: operation["dest"])
+
+
+def remove_dangling_links(operations, *, dry_run=False, on_results=None):
+    """Remove the dangling links and drop them from the link manifest."""
+    results = apply_link_operations(
+        operations,
+        dry_run=dry_run,
+        on_results=on_results,
+    )
+    link_manifest.record(results)
+    return results
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _scan_directory(directory, owners):
+    """Return the real subdirectories and dangling links in the directory."""
+    directories = []
+    dangling = []
+    try:
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                target = get_entry_link_target(entry)
+                if target is None:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    continue
+
+                owner = _get_owner(target, owners)
+                if owner is None or Path(target).exists():
+                    continue
+
+                dangling.append(
+                    get_remove_operation(
+                        (
+                            "directory"
+                            if entry.is_dir(follow_symlinks=False)
+                            else "file"
+                        ),
+                        src=target,
+                        dest=entry.path,
+                    ) | {"owner": owner},
+                )
+    except OSError:
+        pass
+    return directories, dangling
+
+
+def _get_owner(target, owners):
+    for prefix, owner in owners.items():
+        if not target.startswith(prefix):
+            continue
+
+        # Links into the workspace belong to the plugin they point into
+        return owner or PurePath(target[len(prefix):]).parts[0]
+    return None
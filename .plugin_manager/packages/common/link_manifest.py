@@ -0,0 +1,267 @@
+# ../common/link_manifest.py
+
+"""Provides a persistent record of every link the plugin manager creates.
+
+Links can be verified, repaired and removed per plugin or per game from
+the recorded paths alone, without scanning the directories they are in.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import UTC, datetime
+from pathlib import Path
+
+# Package
+from .constants import CACHE_DIR
+from .functions import normalize_path
+from .links import get_link_operation, get_link_target, get_remove_operation
+from .scheduler import RESOURCE_LIMITS
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "OWNER_TYPES",
+    "LinkManifest",
+    "format_verify_result",
+    "get_repair_operations",
+    "get_unlink_operations",
+    "link_manifest",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Operations name their owner with one of these keys
+OWNER_TYPES = ("plugin", "game")
+
+VERIFY_WORKERS = RESOURCE_LIMITS["disk"]
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class LinkManifest(dict):
+    """Maps each link's destination to what it links and who owns it.
+
+    Each value holds the link's source, kind ("directory" or "file"), the
+    type ("plugin" or "game") and name of its owner, and when it was
+    created, or first recorded if it already existed.
+    """
+
+    def __init__(self, path):
+        """Create the manifest, loading it from path if it exists."""
+        super().__init__()
+        self.path = path
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Add the links recorded in the manifest's file."""
+        with suppress(OSError, ValueError):
+            self.update(json.loads(self.path.read_text()))
+
+    def save(self):
+        """Write the manifest to its file, replacing it in one step."""
+        if not self.path.parent.is_dir():
+            self.path.parent.makedirs()
+        temp_path = self.path + f".{os.getpid()}.tmp"
+        temp_path.write_text(json.dumps(self, indent=4, sort_keys=True))
+        Path(temp_path).replace(self.path)
+
+    def get_owners(self, owner_type):
+        """Return the names of the owners of the given type."""
+        return sorted({
+            values["owner"] for values in self.values()
+            if values["owner_type"] == owner_type
+        })
+
+    def get_links(self, owner_type, names):
+        """Return {destination: values} for the links of the owners."""
+        names = set(names)
+        return {
+            dest: values for dest, values in self.items()
+            if values["owner_type"] == owner_type and values["owner"] in names
+        }
+
+    def record(self, results):
+        """Update the manifest with the results of applied link operations.
+
+        Dry runs, failed operations and operations that do not create or
+        remove a link, such as creating directories, are ignored.
+        """
+        created = _get_timestamp()
+        with self.lock:
+            changed = False
+            for result in results:
+                if result["dry_run"] or result["error"] is not None:
+                    continue
+
+                action = result.get("action", "create")
+                if action not in ("create", "repair", "remove"):
+                    continue
+
+                changed = True
+                if action == "remove":
+                    self.pop(result["dest"], None)
+                    continue
+
+                self[result["dest"]] = _get_values(result, created)
+
+            if changed:
+                self.save()
+
+    def adopt(self, operations):
+        """Record the operations' links that already exist but are missing."""
+        created = _get_timestamp()
+        with self.lock:
+            operations = [
+                operation for operation in operations
+                if operation["dest"] not in self
+            ]
+            for operation in operations:
+                self[operation["dest"]] = _get_values(operation, created)
+
+            if operations:
+                self.save()
+
+    def forget(self, destinations):
+        """Stop tracking the links, without touching the filesystem."""
+        with self.lock:
+            changed = False
+            for dest in destinations:
+                if self.pop(dest, None) is not None:
+                    changed = True
+
+            if changed:
+                self.save()
+
+    def verify(self, owner_type, names):
+        """Return the status of each of the owners' recorded links.
+
+        Only the recorded destinations and their sources are checked:
+            ok:           links to its recorded source, which exists
+            missing:      nothing exists at the destination
+            wrong target: links somewhere other than its recorded source
+            dangling:     links to its recorded source, which is missing
+            not a link:   a real file or directory replaced the link
+        """
+        links = self.get_links(owner_type, names)
+        with ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as executor:
+            statuses = executor.map(
+                lambda item: _get_status(*item),
+                links.items(),
+            )
+            return [
+                values | {"dest": dest, "status": status}
+                for (dest, values), status in zip(
+                    links.items(),
+                    statuses,
+                    strict=True,
+                )
+            ]
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_repair_operations(results):
+    """Return the operations fixing the verified links that can be fixed.
+
+    Missing and wrong links are recreated, as long as their source still
+    exists. Dangling links and real files are left for the user.
+    """
+    operations = []
+    for result in results:
+        if result["status"] == "missing":
+            action = "create"
+        elif result["status"] == "wrong target":
+            action = "repair"
+        else:
+            continue
+
+        if not Path(result["src"]).exists():
+            continue
+
+        operations.append(
+            get_link_operation(
+                result["kind"],
+                src=result["src"],
+                dest=result["dest"],
+            ) | {
+                "action": action,
+                result["owner_type"]: result["owner"],
+            },
+        )
+    return operations
+
+
+def get_unlink_operations(results):
+    """Return the operations removing the verified links.
+
+    Links that now point somewhere else, or were replaced, no longer
+    belong to the manifest's owner, so they are not included.
+    """
+    return [
+        get_remove_operation(
+            result["kind"],
+            src=result["src"],
+            dest=result["dest"],
+        ) | {result["owner_type"]: result["owner"]}
+        for result in results
+        if result["status"] in ("ok", "dangling")
+    ]
+
+
+def format_verify_result(result):
+    """Return the console line for the given verify result."""
+    return f"[{result['status']}] {result['dest']} -> {result['src']}"
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_timestamp():
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+def _get_values(operation, created):
+    owner_type = next(
+        (key for key in OWNER_TYPES if key in operation),
+        None,
+    )
+    return {
+        "src": operation["src"],
+        "kind": operation["kind"],
+        "owner_type": owner_type,
+        "owner": operation.get(owner_type),
+        "created": created,
+    }
+
+
+def _get_status(dest, values):
+    target = get_link_target(dest)
+    if target is None:
+        return "not a link" if os.path.lexists(dest) else "missing"
+
+    if target != normalize_path(values["src"]):
+        return "wrong target"
+
+    if not Path(dest).exists():
+        return "dangling"
+
+    return "ok"
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+link_manifest = LinkManifest(CACHE_DIR / "link_manifest.json")
@@ -0,0 +1,279 @@
+# ../common/link_planner.py
+
+"""Plans the links needed to bring LINK_BASE_DIR up to date with plugins.
+
+The desired links of every plugin are compared with what actually exists
+in the link directories, each of which is scanned only once, and the
+differences are returned as a plan that can be applied in batches.
+Applying a plan and planning again results in nothing left to apply.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePath
+
+# Site-package
+from path import Path
+
+# Package
+from .constants import LINK_BASE_DIR, START_DIR, config
+from .fs_snapshot import FileSystemSnapshot
+from .functions import normalize_path
+from .links import (
+    get_entry_link_target,
+    get_link_operation,
+    get_make_directory_operation,
+    get_remove_operation,
+)
+from .scheduler import RESOURCE_LIMITS
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "LINK_SCAN_WORKERS",
+    "PLAN_KEYS",
+    "format_link_plan",
+    "get_desired_links",
+    "get_link_locations",
+    "get_plan_operations",
+    "plan_links",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+LINK_SCAN_WORKERS = RESOURCE_LIMITS["disk"]
+
+# linked:      already links to the right source, nothing to do
+# create:      nothing exists at the destination yet
+# directories: link directories missing for the links to create
+# repair:      a link exists at the destination, but to a different source
+# dangling:    a link into the workspace whose source no longer exists
+# conflicts:   a real file or directory exists at the destination
+PLAN_KEYS = (
+    "linked",
+    "create",
+    "directories",
+    "repair",
+    "dangling",
+    "conflicts",
+)
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_link_locations():
+    """Return {relative path: file extensions} for where plugins link from.
+
+    A plugin's directory named after the plugin in each path is linked,
+    as are its files named after the plugin with any of the extensions.
+    """
+    locations = {
+        config["CONFIG_BASE_PATH"]: ["cfg", "ini"],
+        config["DATA_BASE_PATH"]: ["ini", "json"],
+        config["DOCS_BASE_PATH"]: [],
+        config["EVENTS_BASE_PATH"]: [],
+        config["LOGS_BASE_PATH"]: [],
+        config["PLUGIN_BASE_PATH"]: [],
+        config["SOUND_BASE_PATH"]: ["mp3", "wav"],
+        config["TRANSLATIONS_BASE_PATH"]: [],
+    }
+
+    translations_path = Path(config["TRANSLATIONS_BASE_PATH"])
+    for values in config["CONDITIONAL_PYTHON_FILES"].values():
+        path = values.get("translations_file_path")
+        if not path:
+            continue
+
+        extensions = locations.setdefault(str(translations_path / path), [])
+        if "ini" not in extensions:
+            extensions.append("ini")
+
+    for path in config["CONDITIONAL_PATHS"].values():
+        if path.startswith(translations_path):
+            locations.setdefault(path, [])
+
+    return locations
+
+
+def get_desired_links(plugin_names, snapshot=None):
+    """Return {destination: operation} for every link the plugins need."""
+    if snapshot is None:
+        snapshot = FileSystemSnapshot()
+    locations = get_link_locations()
+    with ThreadPoolExecutor(max_workers=LINK_SCAN_WORKERS) as executor:
+        results = executor.map(
+            lambda plugin_name: _get_plugin_links(
+                plugin_name,
+                locations,
+                snapshot,
+            ),
+            plugin_names,
+        )
+        return {
+            operation["dest"]: operation
+            for operations in results
+            for operation in operations
+        }
+
+
+def plan_links(plugin_names, *, prune_all=False):
+    """Return the plan bringing the plugins' links up to date.
+
+    The plan maps each of PLAN_KEYS to a list of operations. Dangling
+    links are only included for the given plugins, unless prune_all is
+    set, in which case any dangling link into the workspace is included,
+    such as those left behind by deleted or renamed plugins.
+    """
+    plugin_names = set(plugin_names)
+    snapshot = FileSystemSnapshot()
+    desired = get_desired_links(plugin_names, snapshot)
+    directories = {
+        normalize_path(directory): directory
+        for directory in map(LINK_BASE_DIR.joinpath, get_link_locations())
+    }
+    with ThreadPoolExecutor(max_workers=LINK_SCAN_WORKERS) as executor:
+        states = dict(
+            zip(
+                directories,
+                executor.map(
+                    lambda directory: _scan_links(directory, snapshot),
+                    directories.values(),
+                ),
+                strict=True,
+            ),
+        )
+
+    plan = {key: [] for key in PLAN_KEYS}
+    missing = set()
+    for dest, operation in sorted(desired.items()):
+        key = normalize_path(Path(dest).parent)
+        state = states[key].get(Path(dest).name)
+        if state is None:
+            if key not in missing and not snapshot.is_dir(directories[key]):
+                missing.add(key)
+                plan["directories"].append(
+                    get_make_directory_operation(directories[key]),
+                )
+            plan["create"].append(operation | {"action": "create"})
+        elif state["target"] is None:
+            plan["conflicts"].append(operation | {"action": "conflict"})
+        elif state["target"] == normalize_path(operation["src"]):
+            plan["linked"].append(operation)
+        else:
+            plan["repair"].append(operation | {"action": "repair"})
+
+    start_dir = normalize_path(START_DIR) + os.sep
+    for key, entries in sorted(states.items()):
+        for name, state in sorted(entries.items()):
+            target = state["target"]
+            if target is None or not target.startswith(start_dir):
+                continue
+
+            dest = directories[key] / name
+            if str(dest) in desired:
+                continue
+
+            plugin_name = PurePath(target[len(start_dir):]).parts[0]
+            if not prune_all and plugin_name not in plugin_names:
+                continue
+
+            if Path(target).exists():
+                continue
+
+            plan["dangling"].append(
+                get_remove_operation(
+                    "directory" if state["is_dir"] else "file",
+                    src=target,
+                    dest=dest,
+                ) | {"plugin": plugin_name},
+            )
+
+    return plan
+
+
+def get_plan_operations(plan):
+    """Return the operations that apply the plan, in the order to apply them.
+
+    Missing link directories are created first. Then dangling links are
+    removed, wrong links are repaired and finally missing links are
+    created. Conflicts are never touched.
+    """
+    return [
+        *plan["directories"],
+        *plan["dangling"],
+        *plan["repair"],
+        *plan["create"],
+    ]
+
+
+def format_link_plan(plan):
+    """Return the console lines summarizing the plan."""
+    lines = [
+        f"{len(plan['linked'])} linked, {len(plan['create'])} to create, "
+        f"{len(plan['repair'])} to repair, {len(plan['dangling'])} dangling, "
+        f"{len(plan['conflicts'])} conflicting, "
+        f"{len(plan['directories'])} directories to create.",
+    ]
+    lines.extend(
+        f"[conflict] {operation['dest']} exists and is not a link"
+        for operation in plan["conflicts"]
+    )
+    return lines
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_plugin_links(plugin_name, locations, snapshot):
+    operations = []
+    for path, extensions in locations.items():
+        src_dir = START_DIR.joinpath(plugin_name, path)
+        if not snapshot.scan(src_dir):
+            continue
+
+        dest_dir = LINK_BASE_DIR.joinpath(path)
+        if snapshot.is_dir(src_dir / plugin_name):
+            operations.append(
+                get_link_operation(
+                    "directory",
+                    src=src_dir / plugin_name,
+                    dest=dest_dir / plugin_name,
+                ) | {"plugin": plugin_name},
+            )
+
+        for extension in extensions:
+            name = f"{plugin_name}.{extension}"
+            if snapshot.is_file(src_dir / name):
+                operations.append(
+                    get_link_operation(
+                        "file",
+                        src=src_dir / name,
+                        dest=dest_dir / name,
+                    ) | {"plugin": plugin_name},
+                )
+
+    return operations
+
+
+def _scan_links(directory, snapshot):
+    """Return {name: state} for the entries in the directory.
+
+    Each state's target is the normalized path the entry links to, or
+    None if the entry is not a link. Targets are read without following
+    them, so checking a directory costs one scan plus a readlink per link.
+    """
+    return {
+        name: {
+            "target": get_entry_link_target(entry),
+            "is_dir": entry.is_dir(follow_symlinks=False),
+        }
+        for name, entry in snapshot.scan(directory).items()
+    }
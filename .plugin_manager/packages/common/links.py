@@ -0,0 +1,234 @@
+# ../common/links.py
+
+"""Creates and removes directory and file links without the shell.
+
+Link operations can also create the directories and copy the files the
+links need, so planning them never changes anything on disk.
+"""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+import shutil
+import time
+from pathlib import Path
+
+# Package
+from .constants import PLATFORM
+from .functions import (
+    get_copy_file_command,
+    get_link_directory_command,
+    get_link_file_command,
+    get_make_directory_command,
+    get_remove_link_command,
+    normalize_path,
+)
+
+if PLATFORM == "windows":
+    import _winapi
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "LINK_BATCH_SIZE",
+    "apply_link_operations",
+    "create_link",
+    "format_link_result",
+    "get_copy_operation",
+    "get_entry_link_target",
+    "get_link_operation",
+    "get_link_target",
+    "get_make_directory_operation",
+    "get_remove_operation",
+    "remove_link",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Number of links created between each report of the results
+LINK_BATCH_SIZE = 100
+
+# Status shown for each successfully applied action
+_action_statuses = {
+    "create": "linked",
+    "repair": "repaired",
+    "remove": "removed",
+    "mkdir": "created",
+    "copy": "copied",
+}
+
+_link_commands = {
+    "directory": get_link_directory_command,
+    "file": get_link_file_command,
+}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_link_operation(kind, src, dest):
+    """Return an operation linking the source ("directory" or "file")."""
+    if kind not in _link_commands:
+        msg = f'Invalid link kind "{kind}".'
+        raise ValueError(msg)
+
+    return {
+        "kind": kind,
+        "src": str(src),
+        "dest": str(dest),
+        "command": _link_commands[kind](src, dest),
+    }
+
+
+def get_remove_operation(kind, src, dest):
+    """Return an operation removing the link to src at dest."""
+    return {
+        "kind": kind,
+        "src": str(src),
+        "dest": str(dest),
+        "action": "remove",
+        "command": get_remove_link_command(kind, dest),
+    }
+
+
+def get_make_directory_operation(dest):
+    """Return an operation creating the directory and its parents."""
+    return {
+        "kind": "directory",
+        "src": None,
+        "dest": str(dest),
+        "action": "mkdir",
+        "command": get_make_directory_command(dest),
+    }
+
+
+def get_copy_operation(src, dest):
+    """Return an operation copying the file to dest."""
+    return {
+        "kind": "file",
+        "src": str(src),
+        "dest": str(dest),
+        "action": "copy",
+        "command": get_copy_file_command(src, dest),
+    }
+
+
+def create_link(kind, src, dest):
+    """Create the link the same way the equivalent shell command would.
+
+    Directories are linked with a junction on Windows, which does not
+    require elevated privileges, and with a symbolic link elsewhere.
+    """
+    if kind == "directory" and PLATFORM == "windows":
+        _winapi.CreateJunction(str(src), str(dest))
+        return
+
+    os.symlink(src, dest, target_is_directory=kind == "directory")
+
+
+def get_link_target(path):
+    """Return the normalized path the link points to, None if not a link.
+
+    The target is read without following it, so this also works for
+    dangling links.
+    """
+    try:
+        target = Path(path).readlink()
+    except (OSError, ValueError):
+        return None
+    return normalize_path(Path(path).parent / target)
+
+
+def get_entry_link_target(entry):
+    """Return the link target of the os.scandir entry, None if not a link.
+
+    Only symlinks, and directories on Windows where junctions are not
+    reported as symlinks, cost a system call to check.
+    """
+    if not entry.is_symlink() and not (
+        PLATFORM == "windows" and entry.is_dir(follow_symlinks=False)
+    ):
+        return None
+
+    return get_link_target(entry.path)
+
+
+def remove_link(dest):
+    """Remove the link itself, leaving whatever it points to untouched."""
+    Path(dest).unlink()
+
+
+def apply_link_operations(
+    operations,
+    *,
+    dry_run=False,
+    on_results=None,
+    batch_size=LINK_BATCH_SIZE,
+):
+    """Apply each link operation and return the result of each one.
+
+    Operations create their link unless their "action" is "repair", which
+    replaces the existing link, "remove", which only removes it, "mkdir",
+    which creates the directory, or "copy", which copies the file. A
+    failed operation does not stop the remaining ones. on_results, if
+    given, is called with each batch of results as soon as it completes.
+    With dry_run, nothing is changed and every result is reported as
+    skipped.
+    """
+    results = []
+    batch = []
+    for operation in operations:
+        start = time.perf_counter()
+        error = None
+        if not dry_run:
+            action = operation.get("action", "create")
+            try:
+                if action == "mkdir":
+                    Path(operation["dest"]).mkdir(parents=True, exist_ok=True)
+                elif action == "copy":
+                    shutil.copy(operation["src"], operation["dest"])
+                if action in ("repair", "remove"):
+                    remove_link(operation["dest"])
+                if action in ("create", "repair"):
+                    create_link(
+                        operation["kind"],
+                        operation["src"],
+                        operation["dest"],
+                    )
+            except OSError as exception:
+                error = exception.strerror or str(exception)
+
+        batch.append(
+            operation | {
+                "dry_run": dry_run,
+                "error": error,
+                "duration": time.perf_counter() - start,
+            },
+        )
+        if len(batch) >= batch_size:
+            results.extend(batch)
+            if on_results is not None:
+                on_results(batch)
+            batch = []
+
+    if batch:
+        results.extend(batch)
+        if on_results is not None:
+            on_results(batch)
+    return results
+
+
+def format_link_result(result):
+    """Return the console line for the given link result."""
+    if result["dry_run"]:
+        status = "dry run"
+    elif result["error"] is not None:
+        status = f"failed: {result['error']}"
+    else:
+        status = _action_statuses[result.get("action", "create")]
+    return f"[{status}] {result['command']}"
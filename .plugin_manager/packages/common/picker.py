@@ -0,0 +1,297 @@
+# ../common/picker.py
+
+"""Provides a filterable list that only creates widgets for visible rows."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import tkinter as tk
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "Picker",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+ROW_HEIGHT = 28
+ROW_COLOR = "white"
+HOVER_COLOR = "#e5f1fb"
+SELECTED_COLOR = "#cce4f7"
+
+# The mouse buttons X11 reports for scrolling the wheel up and down
+WHEEL_UP_BUTTON = 4
+WHEEL_DOWN_BUTTON = 5
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Picker(tk.Frame):
+    """A list of names that calls on_activate with the name clicked.
+
+    Only enough row widgets to fill the visible area are created, and they
+    are reused as the list scrolls or is filtered. Typing in the filter box
+    narrows the list to names containing the text.
+
+    If actions ({label: callback}) are given, rows can also be selected
+    with Ctrl+click and Shift+click, and each action's button calls its
+    callback with the selected names.
+    """
+
+    def __init__(self, master, items, on_activate, actions=None):
+        """Create the picker listing the items inside master."""
+        super().__init__(master)
+        self.items = list(items)
+        self.matches = self.items
+        self.selected = set()
+        self.on_activate = on_activate
+        self.actions = actions or {}
+        self.offset = 0
+        self.rows = []
+        self._anchor = None
+        self._pattern = ""
+
+        toolbar = tk.Frame(self)
+        toolbar.pack(fill="x", pady=(0, 5))
+        tk.Label(toolbar, text="Filter:").pack(side="left")
+        self.filter_var = tk.StringVar(self)
+        self.filter_entry = tk.Entry(
+            toolbar,
+            textvariable=self.filter_var,
+            width=40,
+        )
+        self.filter_entry.pack(side="left", padx=5)
+        self.filter_entry.bind("<Return>", self.on_return)
+        self.filter_var.trace_add(
+            "write",
+            lambda *_: self.set_filter(self.filter_var.get()),
+        )
+        self.count_label = tk.Label(toolbar)
+        self.count_label.pack(side="left", padx=5)
+
+        if self.actions:
+            action_bar = tk.Frame(self)
+            action_bar.pack(side="bottom", fill="x", pady=(5, 0))
+            tk.Button(
+                action_bar,
+                text="Select All",
+                command=self.select_all,
+            ).pack(side="left", padx=(0, 5))
+            tk.Button(
+                action_bar,
+                text="Clear Selection",
+                command=self.clear_selection,
+            ).pack(side="left", padx=(0, 5))
+            for label, callback in self.actions.items():
+                tk.Button(
+                    action_bar,
+                    text=label,
+                    command=lambda c=callback: self.on_action(c),
+                ).pack(side="left", padx=(0, 5))
+
+        self.scrollbar = tk.Scrollbar(self, command=self.on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = tk.Frame(self, background=ROW_COLOR)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.body.bind("<Configure>", self.on_resize)
+        self._bind_wheel(self.body)
+        self.filter_entry.focus_set()
+        self.render()
+
+    @property
+    def visible_rows(self):
+        """Return how many rows fit in the body."""
+        return max(1, self.body.winfo_height() // ROW_HEIGHT)
+
+    def get_selected(self):
+        """Return the selected names matching the filter, in listed order.
+
+        Names hidden by the filter stay selected, but are not acted on.
+        """
+        return [item for item in self.matches if item in self.selected]
+
+    def set_items(self, items):
+        """Replace the names, keeping the filter and any selection."""
+        items = list(items)
+        if items == self.items:
+            return
+        self.items = items
+        self.selected.intersection_update(self.items)
+        pattern, self._pattern = self._pattern, None
+        self.set_filter(pattern)
+
+    def set_filter(self, pattern):
+        """Only list the names containing the pattern, ignoring case."""
+        pattern = pattern.lower()
+
+        # Narrowing the filter only needs to search the current matches
+        source = self.items
+        if self._pattern is not None and pattern.startswith(self._pattern):
+            source = self.matches
+        self.matches = [item for item in source if pattern in item.lower()]
+        self._pattern = pattern
+
+        # The anchor is an index into the old matches
+        self._anchor = None
+        self.offset = 0
+        self.render()
+
+    def select_all(self):
+        """Select every name matching the filter."""
+        self.selected.update(self.matches)
+        self.render()
+
+    def clear_selection(self):
+        """Deselect every name."""
+        self.selected.clear()
+        self.render()
+
+    def render(self):
+        """Show the matches from the current offset in the existing rows."""
+        self.offset = max(
+            0,
+            min(self.offset, len(self.matches) - self.visible_rows),
+        )
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index >= len(self.matches):
+                row.configure(text="", background=ROW_COLOR, cursor="")
+                continue
+            item = self.matches[index]
+            row.configure(
+                text=item,
+                background=(
+                    SELECTED_COLOR if item in self.selected else ROW_COLOR
+                ),
+                cursor="hand2",
+            )
+
+        if self.matches:
+            first = self.offset / len(self.matches)
+            last = (self.offset + self.visible_rows) / len(self.matches)
+            self.scrollbar.set(first, min(1.0, last))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        text = f"{len(self.matches)} of {len(self.items)}"
+        if self.selected:
+            text += f", {len(self.selected)} selected"
+        self.count_label.configure(text=text)
+
+    def scroll_to(self, offset):
+        """Scroll so the match at the offset is the first row shown."""
+        self.offset = int(offset)
+        self.render()
+
+    def on_scroll(self, *args):
+        """Scroll as requested by the scrollbar."""
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.matches))
+            return
+
+        amount = int(args[1])
+        if args[2] == "pages":
+            amount *= self.visible_rows
+        self.scroll_to(self.offset + amount)
+
+    def on_wheel(self, event):
+        """Scroll three rows for each step of the mouse wheel."""
+        if event.num == WHEEL_UP_BUTTON or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        elif event.num == WHEEL_DOWN_BUTTON or event.delta < 0:
+            self.scroll_to(self.offset + 3)
+
+    def on_resize(self, event):
+        """Create or remove rows to fill the resized body."""
+        # Create or remove rows, so there are only enough to fill the body
+        count = event.height // ROW_HEIGHT + 1
+        while len(self.rows) < count:
+            i = len(self.rows)
+            row = tk.Label(
+                self.body,
+                anchor="w",
+                padx=10,
+                font=("consolas", 10),
+                background=ROW_COLOR,
+            )
+            row.place(x=0, y=i * ROW_HEIGHT, relwidth=1, height=ROW_HEIGHT)
+            row.bind("<Button-1>", lambda _, i=i: self.on_row_click(i))
+            row.bind(
+                "<Control-Button-1>",
+                lambda _, i=i: self.on_row_click(i, toggle=True),
+            )
+            row.bind(
+                "<Shift-Button-1>",
+                lambda _, i=i: self.on_row_click(i, extend=True),
+            )
+            row.bind(
+                "<Enter>",
+                lambda _, i=i: self.on_hover(i, entered=True),
+            )
+            row.bind(
+                "<Leave>",
+                lambda _, i=i: self.on_hover(i, entered=False),
+            )
+            self._bind_wheel(row)
+            self.rows.append(row)
+        while len(self.rows) > count:
+            self.rows.pop().destroy()
+        self.render()
+
+    def on_hover(self, i, *, entered):
+        """Highlight the row while the mouse is over it."""
+        index = self.offset + i
+        if index >= len(self.matches):
+            return
+        if self.matches[index] in self.selected:
+            return
+        self.rows[i].configure(
+            background=HOVER_COLOR if entered else ROW_COLOR,
+        )
+
+    def on_row_click(self, i, *, toggle=False, extend=False):
+        """Activate the row's name, or change the selection.
+
+        toggle adds or removes the name from the selection, and extend
+        selects every name from the last clicked row to this one.
+        """
+        index = self.offset + i
+        if index >= len(self.matches):
+            return
+
+        item = self.matches[index]
+        if not self.actions or not (toggle or extend):
+            self.on_activate(item)
+            return
+
+        if extend and self._anchor is not None:
+            start, end = sorted((self._anchor, index))
+            self.selected.update(self.matches[start:end + 1])
+        elif item in self.selected:
+            self.selected.remove(item)
+        else:
+            self.selected.add(item)
+        self._anchor = index
+        self.render()
+
+    def on_return(self, _event):
+        """Activate the only name matching the filter."""
+        if len(self.matches) == 1:
+            self.on_activate(self.matches[0])
+
+    def on_action(self, callback):
+        """Call the action's callback with the selected names."""
+        selected = self.get_selected()
+        if selected:
+            callback(selected)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel)
+        widget.bind("<Button-4>", self.on_wheel)
+        widget.bind("<Button-5>", self.on_wheel)
@@ -0,0 +1,208 @@
+# ../common/releases.py
+
+"""Provides functions to version and package plugin releases."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from zipfile import ZIP_DEFLATED, ZipFile
+
+# Site-package
+from configobj import ConfigObj
+from git import Repo
+
+# Package
+from .constants import RELEASE_DIR, START_DIR, config
+from .fs_snapshot import FileSystemSnapshot
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "ALLOWED_FILETYPES",
+    "EXCEPTION_FILETYPES",
+    "VERSION_UPDATES",
+    "add_file",
+    "get_new_version",
+    "get_plugin_info",
+    "has_uncommitted_changes",
+    "save_release",
+    "update_version",
+    "validate_file_by_base_path",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+VERSION_UPDATES = [
+    "MAJOR",
+    "MINOR",
+    "PATCH",
+    None,
+]
+
+# Store plugin specific directories with their respective allowed file types
+_readable_data = [
+    "ini",
+    "json",
+    "vdf",
+    "xml",
+]
+ALLOWED_FILETYPES = {
+    config["PLUGIN_BASE_PATH"]: [*_readable_data, "md", "py"],
+    config["DATA_BASE_PATH"]: [*_readable_data, "md", "txt"],
+    config["CONFIG_BASE_PATH"]: [*_readable_data, "cfg", "md", "txt"],
+    config["LOGS_BASE_PATH"]: ["md", "txt"],
+    config["SOUND_BASE_PATH"]: ["md", "mp3", "wav"],
+    config["EVENTS_BASE_PATH"]: ["md", "txt"],
+    config["TRANSLATIONS_BASE_PATH"]: ["md", "ini"],
+    "materials/": ["vmt", "vtf"],
+    "models/": ["mdl", "phy", "vtx", "vvd"],
+}
+
+# Store directories with files that fit allowed_filetypes
+#   with names that should not be included
+EXCEPTION_FILETYPES = {
+    config["TRANSLATIONS_BASE_PATH"]: ["_server.ini"],
+}
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_plugin_info(plugin_name):
+    """Return the plugin's info.ini."""
+    return ConfigObj(
+        START_DIR.joinpath(
+            plugin_name,
+            config["PLUGIN_BASE_PATH"],
+            plugin_name,
+            "info.ini",
+        ),
+    )
+
+
+def has_uncommitted_changes(plugin_name):
+    """Return whether the plugin's repository has any uncommitted changes."""
+    repo = Repo(START_DIR / plugin_name)
+    return (
+        bool(repo.index.diff("HEAD")) or
+        bool(repo.index.diff(None)) or
+        bool(repo.untracked_files)
+    )
+
+
+def get_new_version(current_version, update_type):
+    """Return the version after the update, or None to keep the current."""
+    version_list = list(
+        map(
+            int,
+            current_version.split("."),
+        ),
+    )
+    index = VERSION_UPDATES.index(update_type)
+    if index >= len(version_list):
+        return None
+
+    version_list[index] += 1
+    version_list[index + 1:] = [0] * (len(version_list) - (index + 1))
+    return ".".join(map(str, version_list))
+
+
+def update_version(plugin_name, update_type, new_version):
+    """Update info.ini and return the commands to commit and push it."""
+    print(f"Updating {plugin_name} to version '{new_version}'")
+    info = get_plugin_info(plugin_name)
+    info["version"] = new_version
+    info.write()
+    git = ["git", "-C", str(START_DIR / plugin_name)]
+    return [
+        [
+            *git,
+            "add",
+            "--verbose",
+            f"{config['PLUGIN_BASE_PATH']}/{plugin_name}/info.ini",
+        ],
+        [
+            *git,
+            "commit",
+            "-m",
+            f"{update_type} version update ({new_version})",
+        ],
+        [*git, "push", "origin"],
+    ]
+
+
+def save_release(plugin_name, version):
+    """Create the release zip and return its path, or None if it exists."""
+    snapshot = FileSystemSnapshot()
+    save_path = RELEASE_DIR / plugin_name
+    snapshot.makedirs(save_path)
+
+    zip_path = save_path / f"{plugin_name} - v{version}.zip"
+    if snapshot.is_file(zip_path):
+        print("Release already exists for current version.")
+        return None
+
+    plugin_path = START_DIR / plugin_name
+    repo_files = Repo(plugin_path).git.ls_files().splitlines()
+
+    # Create the zip file
+    with ZipFile(zip_path, "w", ZIP_DEFLATED) as zip_file:
+        for repo_file in repo_files:
+            if validate_file_by_base_path(repo_file):
+                add_file(
+                    relative_file_path=repo_file,
+                    zip_file=zip_file,
+                    plugin_path=plugin_path,
+                    snapshot=snapshot,
+                )
+
+    print(f"Saved release to {zip_path}")
+    return zip_path
+
+
+def validate_file_by_base_path(file):
+    """Return whether the file belongs in a release of its plugin."""
+    for allowed_path in ALLOWED_FILETYPES:
+        if file.startswith(allowed_path):
+            return not (
+                allowed_path in EXCEPTION_FILETYPES and
+                file.endswith(tuple(EXCEPTION_FILETYPES[allowed_path]))
+            )
+    return False
+
+
+def add_file(relative_file_path, zip_file, plugin_path, snapshot=None):
+    """Add the given file and all parent directories to the zip.
+
+    Tracked files that were deleted from the working tree are skipped.
+    """
+    if snapshot is None:
+        snapshot = FileSystemSnapshot()
+    full_file_path = plugin_path / relative_file_path
+    if not snapshot.is_file(full_file_path):
+        return
+
+    zip_file.write(full_file_path, relative_file_path)
+    directory = full_file_path.parent
+
+    # Get all parent directories to add to the zip
+    while directory != plugin_path:
+
+        # Is the current directory already included in the zip? If so,
+        #   its parents were added along with it
+        current = directory.replace(
+            plugin_path,
+            "",
+        )[1:].replace("\\", "/") + "/"
+        try:
+            zip_file.getinfo(current)
+        except KeyError:
+            zip_file.write(directory, current)
+        else:
+            break
+
+        directory = directory.parent
@@ -0,0 +1,117 @@
+# ../common/repositories.py
+
+"""Finds the plugin repositories on GitHub that can be cloned."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import re
+
+# Package
+from .constants import CACHE_DIR, config
+from .github_client import GitHubClient
+from .http_cache import HTTPCache
+from .scheduler import RESOURCE_LIMITS
+from .workspace import workspace
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "FETCH_MODE",
+    "find_repositories",
+    "get_search_query",
+    "identify_repos",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+ORGANIZATIONS = config["ORGANIZATIONS"]
+if ORGANIZATIONS and isinstance(ORGANIZATIONS, str):
+    ORGANIZATIONS = [ORGANIZATIONS]
+ORGANIZATIONS = set(ORGANIZATIONS)
+
+MATCH_TOPICS = config["MATCH_TOPICS"]
+if isinstance(MATCH_TOPICS, str):
+    MATCH_TOPICS = [MATCH_TOPICS]
+MATCH_TOPICS = set(MATCH_TOPICS)
+
+EXCLUDE_TOPICS = config["EXCLUDE_TOPICS"]
+if isinstance(EXCLUDE_TOPICS, str):
+    EXCLUDE_TOPICS = [EXCLUDE_TOPICS]
+EXCLUDE_TOPICS = set(EXCLUDE_TOPICS)
+
+CONVERSIONS = config["CONVERSIONS"]
+
+# Either "list" to filter every repository locally,
+#   or "search" to let GitHub's search API do the filtering
+FETCH_MODE = config.get("FETCH_MODE") or "list"
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def find_repositories(*, force=False):
+    """Return {plugin name: ssh url} for every repository not yet cloned."""
+    client = GitHubClient(
+        token=config["ACCESS_TOKEN"],
+        max_workers=RESOURCE_LIMITS["network"],
+        cache=HTTPCache(CACHE_DIR / "github"),
+        force=force,
+    )
+    if FETCH_MODE == "search":
+        items = client.search_repositories(get_search_query())
+    else:
+        items = client.list_repositories(
+            users=[config["AUTHOR"]],
+            orgs=sorted(ORGANIZATIONS),
+        )
+    return identify_repos(items)
+
+
+def get_search_query():
+    """Return the GitHub search query matching the configured repositories."""
+    qualifiers = [f"user:{config['AUTHOR']}"]
+    qualifiers.extend(f"org:{org}" for org in sorted(ORGANIZATIONS))
+    qualifiers.extend(
+        f"topic:{topic}" for topic in sorted(MATCH_TOPICS) if topic
+    )
+    qualifiers.extend(
+        f"-topic:{topic}" for topic in sorted(EXCLUDE_TOPICS) if topic
+    )
+    qualifiers.extend(["fork:false", "archived:false"])
+    return " ".join(qualifiers)
+
+
+def identify_repos(items):
+    """Return {plugin name: ssh url} for the matching, uncloned repositories."""
+    repos = {}
+    for item in items:
+        if item["fork"] or item["archived"]:
+            continue
+
+        topics = set(item["topics"])
+        if set(EXCLUDE_TOPICS).intersection(topics):
+            continue
+
+        if topics.intersection(set(MATCH_TOPICS)) != MATCH_TOPICS:
+            continue
+
+        name = item["name"]
+        for old, new in CONVERSIONS.items():
+            name = name.replace(old, new)
+
+        name = "_".join(
+            filter(
+                None,
+                re.split(r"(?=[A-Z])", name),
+            ),
+        ).lower()
+        if name in workspace:
+            continue
+
+        repos[name] = item["ssh_url"]
+    return repos
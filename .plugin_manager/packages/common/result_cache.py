@@ -0,0 +1,73 @@
+# ../common/result_cache.py
+
+"""Provides a size-bounded, persistent key/value cache."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+import os
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "ResultCache",
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class ResultCache(OrderedDict):
+    """Stores JSON serializable results, evicting the least recently used.
+
+    Entries are loaded from the given path on creation and only written
+    back when save() is called after a change.
+    """
+
+    def __init__(self, path, max_entries=1000):
+        """Create the cache, loading its entries from path if it exists."""
+        super().__init__()
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.changed = False
+        with suppress(OSError, ValueError):
+            self.update(json.loads(self.path.read_text()))
+
+    def get(self, key, default=None):
+        """Return the key's result, marking it as the most recently used."""
+        if key not in self:
+            return default
+
+        # The recency order is saved too, so reordering is a change
+        if next(reversed(self)) != key:
+            self.move_to_end(key)
+            self.changed = True
+        return self[key]
+
+    def set(self, key, value):
+        """Store the key's result, evicting the least recently used."""
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+        self.changed = True
+
+    def save(self):
+        """Write the entries to the cache's file, if any changed."""
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Checks in the same process can save the same cache at once
+        temp_path = self.path.with_suffix(
+            f".{os.getpid()}-{threading.get_ident()}.tmp",
+        )
+        temp_path.write_text(json.dumps(self))
+        temp_path.replace(self.path)
+        self.changed = False
@@ -0,0 +1,129 @@
+# ../common/runner.py
+
+"""Provides a runner that executes commands on a background thread."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import os
+import queue
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from contextlib import suppress
+
+# Package
+from .constants import PLATFORM
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "CommandRunner",
+    "get_command_string",
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class CommandRunner:
+    """Runs commands one after another, stopping at the first failure.
+
+    String commands are run through the shell, while lists are run as an
+    argument list. Output lines are put on the output queue, so they can be
+    read from another thread. Each command's return code and duration are
+    stored in results once it finishes.
+    """
+
+    def __init__(self, commands):
+        """Create the runner, which does nothing until it is started."""
+        self.commands = list(commands)
+        self.output = queue.Queue()
+        self.results = []
+        self.cancelled = False
+        self.done = threading.Event()
+        self._process = None
+        self._thread = None
+
+    @property
+    def succeeded(self):
+        """Return whether every command ran and returned 0."""
+        return (
+            not self.cancelled and
+            len(self.results) == len(self.commands) and
+            not any(result["returncode"] for result in self.results)
+        )
+
+    def start(self):
+        """Run the commands on a new thread and return the runner."""
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop the current command and skip the remaining ones."""
+        self.cancelled = True
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+
+        with suppress(OSError):
+            if PLATFORM == "windows":
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                    capture_output=True,
+                    check=False,
+                )
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+
+    def run(self):
+        """Run the commands on the calling thread, stopping at a failure."""
+        try:
+            for command in self.commands:
+                if self.cancelled:
+                    break
+                start = time.perf_counter()
+                self._process = subprocess.Popen(
+                    command,
+                    shell=isinstance(command, str),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    start_new_session=PLATFORM != "windows",
+                )
+                for line in self._process.stdout:
+                    self.output.put(line)
+                self.results.append({
+                    "command": get_command_string(command),
+                    "returncode": self._process.wait(),
+                    "duration": time.perf_counter() - start,
+                })
+                if self.results[-1]["returncode"]:
+                    break
+        except OSError as error:
+            self.output.put(f"{error}\n")
+            self.results.append({
+                "command": get_command_string(command),
+                "returncode": -1,
+                "duration": 0.0,
+            })
+        finally:
+            self._process = None
+            self.done.set()
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_command_string(command):
+    """Return the given command as it would be typed into a shell."""
+    if isinstance(command, str):
+        return command
+    if PLATFORM == "windows":
+        return subprocess.list2cmdline(command)
+    return shlex.join(command)
@@ -0,0 +1,214 @@
+# ../common/scheduler.py
+
+"""Provides a job scheduler that limits concurrency per type of resource."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Package
+from .constants import config
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "RESOURCE_LIMITS",
+    "Job",
+    "JobScheduler",
+    "scheduler",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# The maximum number of jobs of each resource type that can run at once
+RESOURCE_LIMITS = {
+    "network": int(config.get("NETWORK_JOBS") or 8),
+    "git": int(config.get("GIT_JOBS") or 8),
+    "disk": int(config.get("DISK_JOBS") or 4),
+    "cpu": int(config.get("CPU_JOBS") or os.cpu_count() or 1),
+}
+
+# The number of finished jobs to keep for display
+JOB_HISTORY = 500
+
+FINISHED_STATUSES = ("done", "failed", "skipped", "cancelled")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Job:
+    """A function to be called by the scheduler once its dependencies finish.
+
+    status moves from "waiting" (for dependencies) to "queued" (for a free
+    slot of its resource) to "running", and then to one of "done",
+    "failed", "skipped" (a dependency did not succeed) or "cancelled".
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, function, resource, depends_on=()):
+        """Create a job calling function once depends_on have finished."""
+        self.id = next(self._ids)
+        self.name = name
+        self.function = function
+        self.resource = resource
+        self.depends_on = tuple(depends_on)
+        self.status = "waiting"
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    def __repr__(self):
+        """Return the job's id, name and status."""
+        return f"<Job {self.id} {self.name!r} {self.status}>"
+
+    @property
+    def finished_status(self):
+        """Return whether the job has reached a final status."""
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def duration(self):
+        """Return the seconds the job has been running, or ran for."""
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+
+class JobScheduler:
+    """Runs submitted jobs on a thread pool per resource type.
+
+    Each pool is sized to the resource's limit, so submitting hundreds of
+    jobs never runs more than the limit of any one type at once.
+    """
+
+    def __init__(self, limits=None):
+        """Create the scheduler with the given {resource: limit}."""
+        self.limits = dict(limits or RESOURCE_LIMITS)
+        self.jobs = []
+        self._waiting = []
+        self._executors = {}
+        self._lock = threading.RLock()
+
+    def submit(self, name, function, resource="cpu", depends_on=()):
+        """Add a job calling the function and return it."""
+        if resource not in self.limits:
+            msg = f'Invalid resource "{resource}".'
+            raise ValueError(msg)
+
+        job = Job(name, function, resource, depends_on)
+        with self._lock:
+            self.jobs.append(job)
+            self._waiting.append(job)
+            self._trim_history()
+        self._dispatch()
+        return job
+
+    def cancel(self, job):
+        """Cancel the job if it has not started running yet."""
+        with self._lock:
+            if job.status not in ("waiting", "queued"):
+                return False
+            self._finish(job, "cancelled")
+        self._dispatch()
+        return True
+
+    def get_counts(self):
+        """Return the number of jobs with each status."""
+        with self._lock:
+            return Counter(job.status for job in self.jobs)
+
+    def shutdown(self, *, wait=False):
+        """Cancel the waiting jobs and stop every thread pool."""
+        with self._lock:
+            for job in self._waiting:
+                self._finish(job, "cancelled")
+            self._waiting.clear()
+            executors = list(self._executors.values())
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _dispatch(self):
+        """Queue each waiting job whose dependencies have all finished."""
+        with self._lock:
+            changed = True
+            while changed:
+                changed = False
+                for job in list(self._waiting):
+                    if job.status == "cancelled":
+                        self._waiting.remove(job)
+                        continue
+
+                    statuses = {dep.status for dep in job.depends_on}
+                    if statuses & {"failed", "skipped", "cancelled"}:
+                        self._waiting.remove(job)
+                        self._finish(job, "skipped")
+                        changed = True
+                        continue
+                    if statuses - {"done"}:
+                        continue
+
+                    self._waiting.remove(job)
+                    job.status = "queued"
+                    self._get_executor(job.resource).submit(self._run, job)
+
+    def _run(self, job):
+        with self._lock:
+            if job.status != "queued":
+                return
+            job.status = "running"
+            job.started = time.perf_counter()
+
+        try:
+            job.result = job.function()
+        except Exception as error:  # noqa: BLE001
+            job.error = error
+            status = "failed"
+        else:
+            status = "done"
+
+        with self._lock:
+            self._finish(job, status)
+        self._dispatch()
+
+    def _get_executor(self, resource):
+        executor = self._executors.get(resource)
+        if executor is None:
+            executor = self._executors[resource] = ThreadPoolExecutor(
+                max_workers=max(1, self.limits[resource]),
+                thread_name_prefix=f"{resource}-job",
+            )
+        return executor
+
+    @staticmethod
+    def _finish(job, status):
+        job.status = status
+        job.finished = time.perf_counter()
+        job.done.set()
+
+    def _trim_history(self):
+        finished = [job for job in self.jobs if job.finished_status]
+        excess = len(finished) - JOB_HISTORY
+        if excess <= 0:
+            return
+        removed = set(finished[:excess])
+        self.jobs = [job for job in self.jobs if job not in removed]
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+scheduler = JobScheduler()
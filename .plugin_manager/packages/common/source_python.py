@@ -0,0 +1,273 @@
+# ../common/source_python.py
+
+"""Finds game installations and links Source.Python's repository to them."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+
+# Site-package
+from configobj import ConfigObj
+from path import Path
+
+# Package
+from .constants import (
+    CACHE_DIR,
+    PLATFORM,
+    START_DIR,
+    config,
+)
+from .fs_snapshot import FileSystemSnapshot
+from .links import (
+    get_copy_operation,
+    get_link_operation,
+    get_make_directory_operation,
+)
+from .scheduler import RESOURCE_LIMITS
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "get_server_link_operations",
+    "get_supported_games",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_binary = "dll" if PLATFORM == "windows" else "so"
+SOURCE_BINARY = f"source-python.{_binary}"
+CORE_BINARY = f"core.{_binary}"
+SOURCE_PYTHON_DIR = Path(config["SOURCE_PYTHON_DIRECTORY"])
+SOURCE_PYTHON_ADDONS_DIR = SOURCE_PYTHON_DIR / "addons" / "source-python"
+SOURCE_PYTHON_BUILDS_DIR = SOURCE_PYTHON_DIR.joinpath(
+    "src",
+    "Builds",
+    "Windows" if PLATFORM == "windows" else "Linux",
+)
+SUPPORT_PATH = START_DIR / ".plugin_manager" / "tools" / "support.ini"
+SUPPORTED_GAMES_CACHE_PATH = CACHE_DIR / "supported_games.json"
+MAX_SCAN_WORKERS = RESOURCE_LIMITS["disk"]
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def get_server_link_operations(game, snapshot=None):
+    """Return the operations linking Source.Python to the installation.
+
+    game is one of the values returned by get_supported_games. Creating
+    missing directories and copying the .vdf file are returned as
+    operations too, so nothing is changed until they are applied. Pass
+    the same snapshot when linking several games, so Source.Python's own
+    directories are only read once.
+    """
+    if snapshot is None:
+        snapshot = FileSystemSnapshot()
+    operations = []
+    path = game["directory"]
+    branch = game["branch"]
+    for dir_name in _get_source_python_directories():
+        directory = path / dir_name
+        if not snapshot.is_dir(directory):
+            operations.append(get_make_directory_operation(directory))
+
+        sp_dir = directory / "source-python"
+        if snapshot.is_dir(sp_dir):
+            continue
+
+        operations.append(
+            get_link_operation(
+                "directory",
+                src=SOURCE_PYTHON_DIR / dir_name / "source-python",
+                dest=sp_dir,
+            ),
+        )
+
+    # Creating the bin directory also creates addons/source-python, which
+    #   the links and files below are placed in
+    server_addons = path / "addons" / "source-python"
+    server_addons_bin = server_addons / "bin"
+    if not snapshot.is_dir(server_addons_bin):
+        operations.append(get_make_directory_operation(server_addons_bin))
+
+    for dir_name in snapshot.dirs(SOURCE_PYTHON_ADDONS_DIR):
+        directory = server_addons / dir_name.stem
+        if snapshot.is_dir(directory):
+            continue
+
+        operations.append(
+            get_link_operation(
+                "directory",
+                src=dir_name,
+                dest=directory,
+            ),
+        )
+
+    vdf = path / "addons" / "source-python.vdf"
+    if not snapshot.is_file(vdf):
+        operations.append(
+            get_copy_operation(
+                SOURCE_PYTHON_DIR.joinpath("addons", "source-python.vdf"),
+                vdf,
+            ),
+        )
+
+    build_dir = SOURCE_PYTHON_BUILDS_DIR / branch
+    if PLATFORM == "windows":
+        build_dir = build_dir / "Release"
+
+    for src, dest in (
+        (build_dir / SOURCE_BINARY, path / "addons" / SOURCE_BINARY),
+        (build_dir / CORE_BINARY, server_addons_bin / CORE_BINARY),
+    ):
+        if snapshot.is_file(src) and not snapshot.is_file(dest):
+            operations.append(
+                get_link_operation(
+                    "file",
+                    src=src,
+                    dest=dest,
+                ),
+            )
+
+    return operations
+
+
+def get_supported_games(*, force=False):
+    """Return every game installation found in the server directories.
+
+    Results are cached on disk, keyed on the mtimes of the server
+    directories and the contents of support.ini.
+    """
+    server_directories = config["SERVER_DIRECTORIES"]
+    if isinstance(server_directories, str):
+        server_directories = [server_directories]
+
+    cache_key = _get_cache_key(server_directories)
+    if not force:
+        with suppress(OSError, ValueError, KeyError):
+            cache = json.loads(SUPPORTED_GAMES_CACHE_PATH.read_text())
+            if cache["key"] == cache_key:
+                return {
+                    game: {
+                        "directory": Path(values["directory"]),
+                        "branch": values["branch"],
+                    }
+                    for game, values in cache["games"].items()
+                }
+
+    games = _get_supported_games(server_directories)
+    if not SUPPORTED_GAMES_CACHE_PATH.parent.is_dir():
+        SUPPORTED_GAMES_CACHE_PATH.parent.makedirs()
+    SUPPORTED_GAMES_CACHE_PATH.write_text(
+        json.dumps(
+            {
+                "key": cache_key,
+                "games": {
+                    game: {
+                        "directory": str(values["directory"]),
+                        "branch": values["branch"],
+                    }
+                    for game, values in games.items()
+                },
+            },
+            indent=4,
+        ),
+    )
+    return games
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_cache_key(server_directories):
+    mtimes = {}
+    for directory in server_directories:
+        try:
+            mtimes[directory] = Path(directory).stat().st_mtime_ns
+        except OSError:
+            mtimes[directory] = None
+    return {
+        "support": hashlib.sha256(SUPPORT_PATH.read_bytes()).hexdigest(),
+        "server_directories": mtimes,
+    }
+
+
+def _get_source_python_directories():
+    # Listed when linking, so importing the module never reads the disk
+    return {
+        x.stem for x in SOURCE_PYTHON_DIR.dirs()
+        if not x.stem.startswith((".", "_")) and
+        x.stem not in ("addons", "src")
+    }
+
+
+def _get_server_candidates(directory):
+    try:
+        with os.scandir(directory) as iterator:
+            return sorted(entry.path for entry in iterator if entry.is_dir())
+    except OSError:
+        return []
+
+
+def _scan_server(directory, support):
+    try:
+        with os.scandir(directory) as iterator:
+            entries = {entry.name: entry.is_dir() for entry in iterator}
+    except OSError:
+        return []
+
+    if not any(
+        entries.get(check_file) is False
+        for check_file in ("srcds.exe", "srcds_run", "srcds_linux")
+    ):
+        return []
+
+    return [
+        (game, Path(directory) / values["folder"], values["branch"])
+        for game, values in support.items()
+        if entries.get(values["folder"]) is True
+    ]
+
+
+def _get_supported_games(server_directories):
+    support = ConfigObj(SUPPORT_PATH)
+    with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS) as executor:
+        candidates = [
+            candidate
+            for candidates in executor.map(
+                _get_server_candidates,
+                server_directories,
+            )
+            for candidate in candidates
+        ]
+        results = executor.map(
+            lambda directory: _scan_server(directory, support),
+            candidates,
+        )
+        installations = [item for result in results for item in result]
+
+    counts = {}
+    for game, _, _ in installations:
+        counts[game] = counts.get(game, 0) + 1
+
+    games = {}
+    for game, directory, branch in installations:
+        label = game
+        if counts[game] > 1:
+            label = f"{game} ({directory.parent.name})"
+            if label in games:
+                label = f"{game} ({directory.parent})"
+        games[label] = {
+            "directory": directory,
+            "branch": branch,
+        }
+    return games
@@ -0,0 +1,402 @@
+# ../common/standards.py
+
+"""Provides a rule engine for Source.Python plugin standards."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ast
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePath
+
+# Site-Package
+from configobj import ConfigObj, ConfigObjError
+from jinja2 import Template
+
+# Package
+from .constants import (
+    CACHE_DIR,
+    CONDITIONAL_PYTHON_FILES_DIR,
+    START_DIR,
+    config,
+)
+from .functions import get_file_hash, get_plugin_check_path
+from .result_cache import ResultCache
+from .scheduler import RESOURCE_LIMITS
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "SourceFile",
+    "check_file_standards",
+    "check_standards",
+    "plugin_rule",
+    "rule",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+# Increase whenever a rule changes, so cached results are discarded
+RULES_VERSION = 3
+MAX_CACHED_RESULTS = 50000
+MAX_CACHED_FILE_HASHES = 50000
+
+# Below this many files, checking in-process is faster than a process pool
+PROCESS_POOL_THRESHOLD = 64
+
+TEMPLATE_DIRECTORIES = (
+    CONDITIONAL_PYTHON_FILES_DIR,
+    START_DIR.joinpath(
+        ".plugin_manager",
+        "example_files",
+        "conditional_python_files",
+    ),
+)
+
+_rules = []
+_plugin_rules = []
+_version_pattern = re.compile(r"^\d+(\.\d+)*$")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class SourceFile:
+    """Stores a plugin file's contents and its AST, parsed only once.
+
+    A file that cannot be read is stored with no contents and its
+    read_error set, as is a file that is not valid UTF-8. A file that
+    cannot be parsed has no tree, and is left for ruff to report.
+    """
+
+    def __init__(self, path, plugin_name, relative_path, template_lines=None):
+        """Read and parse the file at path."""
+        self.path = str(path)
+        self.plugin_name = plugin_name
+        self.relative_path = PurePath(relative_path)
+        self.template_lines = template_lines
+        self.read_error = None
+        try:
+            self.text = Path(path).read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as error:
+            self.text = ""
+            self.read_error = error
+        self.lines = self.text.splitlines()
+        try:
+            self.tree = ast.parse(self.text, filename=path)
+        except (SyntaxError, ValueError):
+            self.tree = None
+
+    def finding(self, code, message, row=1, column=1):
+        """Return a finding for the file at the given position."""
+        return {
+            "code": code,
+            "message": message,
+            "filename": self.path,
+            "row": row,
+            "column": column,
+        }
+
+
+# =============================================================================
+# >> DECORATORS
+# =============================================================================
+def rule(function):
+    """Register a rule that is given each SourceFile and yields findings."""
+    _rules.append(function)
+    return function
+
+
+def plugin_rule(function):
+    """Register a rule that is given each plugin name and yields findings."""
+    _plugin_rules.append(function)
+    return function
+
+
+# =============================================================================
+# >> RULES
+# =============================================================================
+@rule
+def check_header(source):
+    expected = f"# ../{source.plugin_name}/{source.relative_path.as_posix()}"
+    if source.lines[:1] != [expected]:
+        yield source.finding("SP101", f"First line should be '{expected}'")
+
+
+@rule
+def check_all_declared(source):
+    if source.tree is None:
+        return
+    if source.relative_path.name in ("__init__.py", "info.py"):
+        return
+
+    public = False
+    for node in source.tree.body:
+        names = []
+        if isinstance(
+            node,
+            (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef),
+        ):
+            names.append(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [
+                node.target,
+            ]
+            names.extend(
+                target.id for target in targets
+                if isinstance(target, ast.Name)
+            )
+        if "__all__" in names:
+            return
+        public = public or any(not name.startswith("_") for name in names)
+
+    if public:
+        yield source.finding("SP102", "Module does not declare __all__")
+
+
+@rule
+def check_info_import(source):
+    if source.tree is None or source.relative_path.name == "info.py":
+        return
+
+    # The info module is always in the plugin's top-level package
+    level = len(source.relative_path.parts)
+    for node in ast.walk(source.tree):
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        if not any(alias.name == "info" for alias in node.names):
+            continue
+        if node.module == "info" and node.level == level:
+            continue
+        yield source.finding(
+            "SP103",
+            f"info should be imported using 'from {'.' * level}info "
+            f"import info'",
+            node.lineno,
+            node.col_offset + 1,
+        )
+
+
+@rule
+def check_template(source):
+    if source.template_lines is None:
+        return
+
+    lines = iter(source.lines)
+    for expected in source.template_lines:
+        if expected not in lines:
+            yield source.finding(
+                "SP104",
+                f"File does not match its template, missing or out of "
+                f"order: '{expected}'",
+            )
+            return
+
+
+@plugin_rule
+def check_info_file(plugin_name):
+    path = get_plugin_check_path(plugin_name) / "info.ini"
+    if not path.is_file():
+        yield _get_plugin_finding(path, "SP001", "Missing info.ini")
+        return
+
+    try:
+        version = ConfigObj(path).get("version")
+    except ConfigObjError:
+        version = None
+    if not isinstance(version, str) or not _version_pattern.match(version):
+        yield _get_plugin_finding(
+            path,
+            "SP002",
+            f"info.ini does not hold a parseable version: {version!r}",
+        )
+
+
+# =============================================================================
+# >> FUNCTIONS
+# =============================================================================
+def check_file_standards(filenames):
+    """Return the rule findings for only the given files."""
+    jobs = []
+    for filename in filenames:
+        if not filename.endswith(".py") or not Path(filename).is_file():
+            continue
+        parts = PurePath(filename).relative_to(START_DIR).parts
+        plugin_path = get_plugin_check_path(parts[0])
+        relative_path = os.path.relpath(filename, plugin_path)
+        if relative_path.startswith(".."):
+            continue
+        jobs.append(_get_job(filename, parts[0], relative_path))
+    return _run_jobs(jobs)
+
+
+def check_standards(plugin_names):
+    """Check every file of the given plugins against the registered rules.
+
+    Each file is parsed once and every rule shares its AST. Results are
+    cached by file hash, and uncached files are spread over a process pool.
+    """
+    findings = []
+    jobs = []
+    for plugin_name in plugin_names:
+        plugin_path = get_plugin_check_path(plugin_name)
+        if not plugin_path.is_dir():
+            continue
+        for plugin_rule_function in _plugin_rules:
+            findings.extend(plugin_rule_function(plugin_name))
+        for root, dirs, files in os.walk(plugin_path):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if not name.endswith(".py"):
+                    continue
+                path = str(Path(root, name))
+                relative_path = os.path.relpath(path, plugin_path)
+                jobs.append(_get_job(path, plugin_name, relative_path))
+    findings.extend(_run_jobs(jobs))
+    return findings
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_plugin_finding(path, code, message):
+    return {
+        "code": code,
+        "message": message,
+        "filename": str(path),
+        "row": 1,
+        "column": 1,
+    }
+
+
+def _get_template_lines(plugin_name, relative_path):
+    """Return the lines of the rendered template the file must contain."""
+    if os.sep in relative_path or "/" in relative_path:
+        return None
+
+    for directory in TEMPLATE_DIRECTORIES:
+        path = directory / relative_path
+        if path.is_file():
+            break
+    else:
+        return None
+
+    with path.open() as open_file:
+        text = Template(open_file.read()).render(
+            plugin_name=plugin_name,
+            plugin_prefix="".join(
+                [i[0] for i in plugin_name.split("_")],
+            ) + "_",
+            author=config["AUTHOR"],
+        )
+
+    # Only the docstring, section headers, and imports are required
+    return [
+        line for line in text.splitlines()
+        if line.startswith(('"""', "# >>", "from ", "import "))
+    ]
+
+
+def _get_job(path, plugin_name, relative_path):
+    return (
+        path,
+        plugin_name,
+        relative_path,
+        _get_template_lines(plugin_name, relative_path),
+    )
+
+
+def _get_cache_key(job, file_hashes):
+    path, plugin_name, relative_path, template_lines = job
+    return hashlib.sha256(
+        json.dumps([
+            RULES_VERSION,
+            plugin_name,
+            PurePath(relative_path).as_posix(),
+            get_file_hash(path, file_hashes),
+            template_lines,
+        ]).encode(),
+    ).hexdigest()
+
+
+def _get_read_finding(path, error):
+    if isinstance(error, UnicodeDecodeError):
+        return _get_plugin_finding(
+            path,
+            "SP106",
+            f"File is not valid UTF-8: {error.reason} at byte {error.start}",
+        )
+    return _get_plugin_finding(
+        path,
+        "SP107",
+        f"File could not be read: {error.strerror or error}",
+    )
+
+
+def _check_job(job):
+    source = SourceFile(*job)
+
+    # Rules cannot check a file that could not be read, and the sweep
+    #   carries on with the other files
+    if source.read_error is not None:
+        return [_get_read_finding(source.path, source.read_error)]
+
+    return [
+        finding
+        for rule_function in _rules
+        for finding in rule_function(source)
+    ]
+
+
+def _run_jobs(jobs):
+    cached_results = ResultCache(
+        CACHE_DIR / "standards_results.json",
+        max_entries=MAX_CACHED_RESULTS,
+    )
+    file_hashes = ResultCache(
+        CACHE_DIR / "standards_file_hashes.json",
+        max_entries=MAX_CACHED_FILE_HASHES,
+    )
+    findings = []
+    missing = {}
+    for job in jobs:
+        try:
+            key = _get_cache_key(job, file_hashes)
+        except OSError as error:
+            # Such as a file deleted or locked during the sweep
+            findings.append(_get_read_finding(job[0], error))
+            continue
+        cached = cached_results.get(key)
+        if cached is None:
+            missing[key] = job
+        else:
+            findings.extend(cached)
+
+    if len(missing) < PROCESS_POOL_THRESHOLD:
+        results = map(_check_job, missing.values())
+        for key, result in zip(missing, results, strict=True):
+            cached_results.set(key, result)
+            findings.extend(result)
+    else:
+        workers = RESOURCE_LIMITS["cpu"]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                _check_job,
+                missing.values(),
+                chunksize=max(1, len(missing) // workers // 4),
+            )
+            for key, result in zip(missing, results, strict=True):
+                cached_results.set(key, result)
+                findings.extend(result)
+
+    cached_results.save()
+    file_hashes.save()
+    return findings
@@ -0,0 +1,226 @@
+# ../common/watcher.py
+
+"""Provides a file watcher using inotify on Linux, or polling elsewhere."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+
+# Package
+from .constants import PLATFORM
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "Watcher",
+)
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+DEBOUNCE = 0.3
+POLL_INTERVAL = 0.5
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Watcher:
+    """Watches directories and reports the files that changed within them.
+
+    The callback is called on the watcher's thread with the set of changed
+    file paths once no further changes have been seen for the debounce
+    period. Only files ending with one of the given suffixes are reported.
+    """
+
+    def __init__(
+        self,
+        paths,
+        callback,
+        suffixes=(".py",),
+        debounce=DEBOUNCE,
+        interval=POLL_INTERVAL,
+    ):
+        """Create the watcher, which does nothing until it is started."""
+        self.paths = [str(path) for path in paths]
+        self.callback = callback
+        self.suffixes = tuple(suffixes)
+        self.debounce = debounce
+        self.interval = interval
+        self._listings = {}
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching the paths on a new thread."""
+        backend = self._watch_polling
+        if PLATFORM == "linux" and _get_libc() is not None:
+            backend = self._watch_inotify
+        self._thread = threading.Thread(target=backend, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching once the current wait times out."""
+        self._stopped.set()
+
+    def _report(self, pending):
+        changed = {path for path in pending if path.endswith(self.suffixes)}
+        if changed:
+            self.callback(changed)
+
+    def _watch_inotify(self):
+        libc = _get_libc()
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            self._watch_polling()
+            return
+
+        watches = {}
+
+        def add_watch(directory):
+            for root, dirs, _ in os.walk(directory):
+                descriptor = libc.inotify_add_watch(
+                    fd,
+                    os.fsencode(root),
+                    _WATCH_MASK,
+                )
+                if descriptor >= 0:
+                    watches[descriptor] = root
+                dirs[:] = [name for name in dirs if not name.startswith(".")]
+
+        try:
+            for path in self.paths:
+                add_watch(path)
+
+            pending = set()
+            last_event = 0.0
+            while not self._stopped.is_set():
+                timeout = self.debounce if pending else self.interval
+                readable, _, _ = select.select([fd], [], [], timeout)
+                if readable:
+                    with suppress(BlockingIOError):
+                        data = os.read(fd, 65536)
+                        for mask, path in _parse_events(data, watches):
+                            if mask & _IN_ISDIR:
+                                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                                    add_watch(path)
+                                continue
+                            pending.add(path)
+                            last_event = time.monotonic()
+                if pending and time.monotonic() - last_event >= self.debounce:
+                    self._report(pending)
+                    pending = set()
+        finally:
+            os.close(fd)
+
+    def _watch_polling(self):
+        previous = self._get_state()
+        pending = set()
+        last_event = 0.0
+        while not self._stopped.wait(self.interval):
+            current = self._get_state()
+            changed = {
+                path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)
+            }
+            previous = current
+            if changed:
+                pending.update(changed)
+                last_event = time.monotonic()
+            if pending and time.monotonic() - last_event >= self.debounce:
+                self._report(pending)
+                pending = set()
+
+    def _get_state(self):
+        """Return {path: (mtime, size)} for the watched files.
+
+        A directory is only listed again once its own mtime changes, which
+        happens when entries are added, removed or renamed. Otherwise only
+        its files are stat'ed, to catch files edited in place.
+        """
+        state = {}
+        listings = {}
+        directories = list(self.paths)
+        while directories:
+            directory = directories.pop()
+            try:
+                mtime = Path(directory).stat().st_mtime_ns
+            except OSError:
+                continue
+
+            listing = self._listings.get(directory)
+            if listing is None or listing[0] != mtime:
+                listing = (mtime, *self._list_directory(directory))
+            listings[directory] = listing
+            _, subdirectories, files = listing
+            directories.extend(subdirectories)
+            for path in files:
+                with suppress(OSError):
+                    stat = Path(path).stat()
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+
+        self._listings = listings
+        return state
+
+    def _list_directory(self, directory):
+        subdirectories = []
+        files = []
+        with suppress(OSError), os.scandir(directory) as iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        subdirectories.append(entry.path)
+                elif entry.name.endswith(self.suffixes):
+                    files.append(entry.path)
+        return subdirectories, files
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_libc():
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    libc = ctypes.CDLL(name, use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+def _parse_events(data, watches):
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        descriptor, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        name = data[offset:offset + length].rstrip(b"\0")
+        offset += length
+        directory = watches.get(descriptor)
+        if directory is None or not name:
+            continue
+        yield mask, str(Path(directory, os.fsdecode(name)))
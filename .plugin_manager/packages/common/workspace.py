@@ -0,0 +1,165 @@
+# ../common/workspace.py
+
+"""Provides a persistent index of the plugins in the workspace."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+import os
+from contextlib import suppress
+from pathlib import Path
+
+# Site-Package
+from configobj import ConfigObj
+
+# Package
+from .constants import BASE_PATHS, CACHE_DIR, START_DIR, config
+
+# =============================================================================
+# >> ALL
+# =============================================================================
+__all__ = (
+    "WorkspaceIndex",
+    "workspace",
+)
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class WorkspaceIndex(dict):
+    """Maps each plugin name to the information stored about it.
+
+    Each value is a dictionary holding the plugin's path, the mtime of its
+    top-level directory and info.ini, whether it is a git repository, its
+    info.ini version, the base paths it contains files for, and the mtime
+    of each base path's directory, so adding or removing files in one
+    re-indexes the plugin.
+    """
+
+    def __init__(self, path):
+        """Create the index, loading it from path if it exists."""
+        super().__init__()
+        self.path = path
+        self.load()
+
+    @property
+    def names(self):
+        """Return the indexed plugin names, sorted."""
+        return sorted(self)
+
+    def load(self):
+        """Add the plugins stored in the index's file."""
+        with suppress(OSError, ValueError):
+            self.update(json.loads(self.path.read_text()))
+
+    def save(self):
+        """Write the index to its file."""
+        if not self.path.parent.is_dir():
+            self.path.parent.makedirs()
+        self.path.write_text(json.dumps(self, indent=4, sort_keys=True))
+
+    def refresh(self):
+        """Re-index only the plugins whose directories have changed."""
+        changed = False
+        found = set()
+        with os.scandir(START_DIR) as iterator:
+            for entry in iterator:
+                name = entry.name
+                if name.startswith((".", "_")) or not entry.is_dir():
+                    continue
+                found.add(name)
+                mtime = entry.stat().st_mtime_ns
+                values = self.get(name)
+                if (
+                    values is not None and
+                    values["mtime"] == mtime and
+                    values["info_mtime"] == _get_mtime(values["info_path"]) and
+                    values.get("base_path_mtimes") ==
+                    _get_base_path_mtimes(entry.path)
+                ):
+                    continue
+                self.index_plugin(name, mtime)
+                changed = True
+
+        for name in set(self).difference(found):
+            del self[name]
+            changed = True
+
+        if changed:
+            self.save()
+
+    def add(self, plugin_name):
+        """Index a plugin that was just created or cloned."""
+        path = START_DIR / plugin_name
+        if not path.is_dir():
+            return
+        self.index_plugin(plugin_name, path.stat().st_mtime_ns)
+        self.save()
+
+    def index_plugin(self, plugin_name, mtime):
+        """Store the information about the plugin."""
+        path = START_DIR / plugin_name
+        info_path = path.joinpath(
+            config["PLUGIN_BASE_PATH"],
+            plugin_name,
+            "info.ini",
+        )
+        info_mtime = _get_mtime(info_path)
+
+        # Read before listing, so a change made meanwhile is seen next time
+        base_path_mtimes = _get_base_path_mtimes(path)
+        version = None
+        if info_mtime is not None:
+            version = ConfigObj(info_path).get("version")
+
+        self[plugin_name] = {
+            "path": str(path),
+            "mtime": mtime,
+            "is_git": path.joinpath(".git").exists(),
+            "info_path": str(info_path),
+            "info_mtime": info_mtime,
+            "version": version,
+            "base_paths": [
+                key for key, base_path in BASE_PATHS.items()
+                if _has_base_path(path / base_path, plugin_name)
+            ],
+            "base_path_mtimes": base_path_mtimes,
+        }
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_mtime(path):
+    try:
+        return Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _get_base_path_mtimes(path):
+    return {
+        key: _get_mtime(Path(path) / base_path)
+        for key, base_path in BASE_PATHS.items()
+    }
+
+
+def _has_base_path(directory, plugin_name):
+    prefix = f"{plugin_name}."
+    try:
+        with os.scandir(directory) as iterator:
+            return any(
+                entry.name == plugin_name or entry.name.startswith(prefix)
+                for entry in iterator
+            )
+    except OSError:
+        return False
+
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+workspace = WorkspaceIndex(CACHE_DIR / "workspace.json")
@@ -6,11 +6,25 @@
 # >> IMPORTS
 # =============================================================================
 # Python
+import queue
 import sys
+import tkinter as tk
+from tkinter import filedialog, ttk
 
 # Package
-from common.constants import PLUGIN_LIST, START_DIR, config
+from common.checker import check_files, check_plugins
+from common.functions import get_plugin_check_path
 from common.interface import BaseInterface
+from common.watcher import Watcher
+from common.workspace import workspace
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_columns = {
+    "findings": "Findings",
+    "rules": "Rules",
+}
 
 
 # =============================================================================
@@ -21,23 +35,250 @@ class Interface(BaseInterface):
     name = "Plugin Checker"
     stdout = sys.stdout
     stderr = sys.stderr
+    results = None
+    tree = None
+    watcher = None
+    watch_button = None
+    picker = None
 
     def run(self):
+        self.stop_watching()
         self.window.title(self.name)
-        self.clear_grid()
-        self.create_grid(data=PLUGIN_LIST)
-        self.add_back_button(self.on_back_to_main)
+        workspace.refresh()
+        self.show_screen(
+            "picker",
+            build=self.build_picker_screen,
+            update=lambda _: self.picker.set_items(workspace.names),
+        )
+
+    def build_picker_screen(self, frame):
+        """Build the plugin picker and its buttons in the frame."""
+        self.picker = self.create_picker(
+            data=workspace.names,
+            actions={"Check Selected": self.check},
+            parent=frame,
+        )
+        self.add_back_button(self.on_back_to_main, parent=frame)
+        check_all_button = tk.Button(
+            frame,
+            text="Check All",
+            command=self.on_check_all,
+        )
+        check_all_button.place(x=70, y=730)
 
     def on_click(self, option):
+        self.check([option])
+
+    def on_check_all(self):
+        """Check every plugin."""
+        self.check(workspace.names)
+
+    def check(self, plugin_names):
+        """Check the plugins in the background, then show the results."""
         self.clear_grid()
-        console = self.get_console()
-        plugin_path = START_DIR.joinpath(
-            option,
-            config["PLUGIN_BASE_PATH"],
-            option,
+        label = tk.Label(
+            self.window,
+            text=f"Checking {len(plugin_names)} plugin(s)...",
+            font=("times", 14, "bold"),
+        )
+        label.pack(pady=20)
+        self.add_back_button(self.run)
+        self.run_in_background(
+            function=lambda: check_plugins(plugin_names),
+            on_complete=lambda results: self.on_check_complete(
+                label,
+                results,
+            ),
+            name=f"Check {len(plugin_names)} plugin(s)",
+        )
+
+    def on_check_complete(self, label, results):
+        """Show the results, unless the checking screen was left."""
+        # Do nothing if the user left the screen while checking
+        if not label.winfo_exists():
+            return
+
+        self.clear_grid()
+        self.results = results
+        self.show_results()
+        if len(results) == 1:
+            plugin_name = next(iter(results))
+            self.tree.item(plugin_name, open=True)
+            self.populate_findings(plugin_name)
+
+    def update_title(self):
+        """Show the current finding and plugin counts in the title."""
+        self.window.title(
+            f"{self.name} - {self.results.total} findings in "
+            f"{len(self.results)} plugins",
+        )
+
+    def show_results(self):
+        """Build the results tree and its buttons."""
+        self.update_title()
+        frame = tk.Frame(self.window)
+        frame.pack(fill="both", expand=True, padx=10, pady=(10, 50))
+        scrollbar = tk.Scrollbar(frame)
+        scrollbar.pack(side="right", fill="y")
+        tree = self.tree = ttk.Treeview(
+            frame,
+            columns=list(_columns),
+            yscrollcommand=scrollbar.set,
+        )
+        scrollbar.configure(command=tree.yview)
+        tree.heading("#0", text="Plugin", command=lambda: self.sort(tree))
+        tree.column("#0", width=250, stretch=False)
+        for column, text in _columns.items():
+            tree.heading(
+                column,
+                text=text,
+                command=lambda c=column: self.sort(tree, c),
+            )
+        tree.column("findings", width=80, stretch=False, anchor="e")
+        tree.pack(side="left", fill="both", expand=True)
+        for plugin_name in sorted(self.results):
+            tree.insert("", "end", iid=plugin_name, text=plugin_name)
+            self.update_plugin_row(plugin_name)
+
+        tree.bind(
+            "<<TreeviewOpen>>",
+            lambda _: self.populate_findings(tree.focus()),
+        )
+        export_button = tk.Button(
+            self.window,
+            text="Export JSON",
+            command=self.on_export,
         )
-        self.execute_console_commands(
-            console=console,
-            commands=[f"ruff check {plugin_path}"],
+        export_button.place(x=70, y=730)
+        self.watch_button = tk.Button(
+            self.window,
+            text="Watch",
+            command=self.toggle_watching,
         )
+        self.watch_button.place(x=170, y=730)
         self.add_back_button(self.run)
+
+    def update_plugin_row(self, plugin_name):
+        """Update the plugin's counts and findings without a rebuild."""
+        counts = self.results.get_rule_counts(plugin_name)
+        self.tree.item(
+            plugin_name,
+            values=(
+                len(self.results[plugin_name]),
+                ", ".join(
+                    f"{code} x{count}" for code, count in counts.most_common()
+                ),
+            ),
+        )
+        self.tree.delete(*self.tree.get_children(plugin_name))
+        if not counts:
+            return
+
+        if self.tree.item(plugin_name, "open"):
+            self.populate_findings(plugin_name)
+        else:
+            # Placeholder so the plugin can be expanded
+            self.tree.insert(plugin_name, "end")
+
+    def populate_findings(self, plugin_name):
+        """Add the plugin's findings to the tree, if not already added."""
+        if plugin_name not in self.results:
+            return
+
+        # Only populate the findings the first time the plugin is opened
+        children = self.tree.get_children(plugin_name)
+        if children and (
+            len(children) != 1 or self.tree.item(children[0], "text")
+        ):
+            return
+
+        self.tree.delete(*children)
+        plugin_path = get_plugin_check_path(plugin_name)
+        for finding in sorted(
+            self.results[plugin_name],
+            key=lambda item: (item["filename"], item["row"], item["column"]),
+        ):
+            location = (
+                f"{plugin_path.relpathto(finding['filename'])}:"
+                f"{finding['row']}:{finding['column']}"
+            )
+            self.tree.insert(
+                plugin_name,
+                "end",
+                text=location,
+                values=(finding["code"], finding["message"]),
+            )
+
+    @staticmethod
+    def sort(tree, column=None, *, reverse=False):
+        """Sort the tree's plugins by the column, or by name if None."""
+        def get_key(item):
+            if column is None:
+                return tree.item(item, "text")
+            value = tree.set(item, column)
+            return int(value) if column == "findings" else value
+
+        items = sorted(tree.get_children(""), key=get_key, reverse=reverse)
+        for index, item in enumerate(items):
+            tree.move(item, "", index)
+
+        heading = "#0" if column is None else column
+        tree.heading(
+            heading,
+            command=lambda: Interface.sort(tree, column, reverse=not reverse),
+        )
+
+    def on_export(self):
+        """Save the results to a JSON file chosen by the user."""
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")],
+            initialfile="plugin_checker_results.json",
+        )
+        if path:
+            self.results.save(path)
+
+    def toggle_watching(self):
+        """Start or stop rechecking the plugins' files as they change."""
+        if self.watcher is not None:
+            self.stop_watching()
+            return
+
+        changes = queue.Queue()
+        self.watcher = Watcher(
+            paths=[
+                get_plugin_check_path(plugin_name)
+                for plugin_name in self.results
+                if get_plugin_check_path(plugin_name).is_dir()
+            ],
+            callback=lambda filenames: changes.put(
+                (filenames, check_files(filenames)),
+            ),
+        )
+        self.watcher.start()
+        self.watch_button.configure(text="Stop Watching")
+        self.window.after(100, lambda: self.apply_changes(changes))
+
+    def stop_watching(self):
+        """Stop the watcher, if one is running."""
+        if self.watcher is None:
+            return
+        self.watcher.stop()
+        self.watcher = None
+        if self.watch_button is not None and self.watch_button.winfo_exists():
+            self.watch_button.configure(text="Watch")
+
+    def apply_changes(self, changes):
+        """Update the results with the rechecked files, then poll again."""
+        if self.watcher is None:
+            return
+
+        while True:
+            try:
+                filenames, findings = changes.get_nowait()
+            except queue.Empty:
+                break
+            for plugin_name in self.results.replace_files(filenames, findings):
+                self.update_plugin_row(plugin_name)
+            self.update_title()
+        self.window.after(100, lambda: self.apply_changes(changes))
@@ -2,45 +2,14 @@
 # >> IMPORTS
 # =============================================================================
 # Python
-import re
-
-# Site-package
-import requests
+import functools
+import tkinter as tk
 
 # Package
-from common.constants import (
-    PLUGIN_LIST,
-    START_DIR,
-    config,
-)
+from common.cloning import clone_repository, update_mirrors_in_background
 from common.interface import BaseInterface
-
-# =============================================================================
-# >> GLOBAL VARIABLES
-# =============================================================================
-repo_url = (
-    "https://api.github.com/users/{author}/repos"
-    "?per_page={per_page}&page={page}"
-)
-orgs_url = "https://api.github.com/orgs/{org}/repos"
-per_page = 30
-
-ORGANIZATIONS = config["ORGANIZATIONS"]
-if ORGANIZATIONS and isinstance(ORGANIZATIONS, str):
-    ORGANIZATIONS = [ORGANIZATIONS]
-ORGANIZATIONS = set(ORGANIZATIONS)
-
-MATCH_TOPICS = config["MATCH_TOPICS"]
-if isinstance(MATCH_TOPICS, str):
-    MATCH_TOPICS = [MATCH_TOPICS]
-MATCH_TOPICS = set(MATCH_TOPICS)
-
-EXCLUDE_TOPICS = config["EXCLUDE_TOPICS"]
-if isinstance(EXCLUDE_TOPICS, str):
-    EXCLUDE_TOPICS = [EXCLUDE_TOPICS]
-EXCLUDE_TOPICS = set(EXCLUDE_TOPICS)
-
-CONVERSIONS = config["CONVERSIONS"]
+from common.repositories import find_repositories
+from common.workspace import workspace
 
 
 # =============================================================================
@@ -50,82 +19,128 @@ class Interface(BaseInterface):
 
     name = "Plugin Cloner"
     repos = {}
+    picker = None
+    fetching = False
 
-    def run(self, plugin_name=None):
+    def run(self, *, force=False):
+        """Show the picker, retrieving the repositories if needed."""
         self.window.title(self.name)
-        self.clear_grid()
-        if not self.repos:
-            self.populate_repos_from_user()
-            self.populate_repos_from_organizations()
-
-        if plugin_name and (START_DIR / plugin_name).is_dir():
-            del self.repos[plugin_name]
-
-        self.create_grid(data=self.repos)
-        self.add_back_button(self.on_back_to_main)
-
-    def identify_repos(self, url):
-        page = 0
-        while True:
-            page += 1
-            current_url = url.format(
-                author=config["AUTHOR"],
-                per_page=per_page,
-                page=page,
+        workspace.refresh()
+        if force:
+            self.repos.clear()
+            self.fetching = False
+        if not self.repos and not self.fetching:
+            # The listing is requested on the network pool, and the picker
+            #   is filled in once it arrives
+            self.fetching = True
+            self.window.title(f"{self.name} (retrieving repositories...)")
+            update_mirrors_in_background()
+            self.run_in_background(
+                functools.partial(find_repositories, force=force),
+                self.on_repositories_found,
+                name="Find repositories",
+                resource="network",
             )
-            response = requests.get(
-                url=current_url,
-                headers={"User-Agent": "PluginManager"},
-            )
-            if response.status_code != 200:
-                print(
-                    f"Error retrieving plugin list for {current_url}:"
-                    f" {response.status_code}"
-                )
-                break
-
-            items = response.json()
-            for item in items:
-                if item["fork"] or item["archived"]:
-                    continue
-
-                topics = set(item["topics"])
-                if set(EXCLUDE_TOPICS).intersection(topics):
-                    continue
 
-                if topics.intersection(set(MATCH_TOPICS)) != MATCH_TOPICS:
-                    continue
-
-                name = item["name"]
-                for old, new in CONVERSIONS.items():
-                    name = name.replace(old, new)
-
-                name = "_".join(
-                    filter(
-                        None,
-                        re.split(r"(?=[A-Z])", name)
-                    )
-                ).lower()
-                if name in PLUGIN_LIST:
-                    continue
-
-                self.repos[name] = item["ssh_url"]
+        self.show_screen(
+            "picker",
+            build=self.build_picker_screen,
+            update=lambda _: self.picker.set_items(sorted(self.repos)),
+        )
 
-            if len(items) < per_page:
-                break
+    def on_repositories_found(self, repos):
+        """Fill in the picker with the retrieved repositories."""
+        self.fetching = False
+        self.window.title(self.name)
+        self.repos.clear()
+        self.repos.update(repos)
+        if self.picker is not None:
+            self.picker.set_items(sorted(self.repos))
+
+    def build_picker_screen(self, frame):
+        """Build the repository picker and its buttons in the frame."""
+        self.picker = self.create_picker(
+            data=sorted(self.repos),
+            actions={"Clone Selected": self.on_bulk_clone},
+            parent=frame,
+        )
+        self.add_back_button(self.on_back_to_main, parent=frame)
+        refresh_button = tk.Button(
+            frame,
+            text="Refresh",
+            command=lambda: self.run(force=True),
+        )
+        refresh_button.place(x=70, y=730)
 
-    def populate_repos_from_user(self):
-        self.identify_repos(url=repo_url)
+    def on_click(self, option):
+        self.on_bulk_clone([option])
 
-    def populate_repos_from_organizations(self):
-        for org in ORGANIZATIONS:
-            self.identify_repos(url=orgs_url.format(org=org))
+    def on_bulk_clone(self, names):
+        """Clone the repositories, each as its own network job."""
+        if not names:
+            return
 
-    def on_click(self, option):
         self.clear_grid()
         console = self.get_console()
-        self.execute_console_commands(
-            console=console,
-            commands=[f"git clone {self.repos[option]} {START_DIR / option}"]
+        for name in names:
+            console.add_section(name)
+
+        # Each clone is its own network job, so the scheduler limits how
+        #   many run at once
+        jobs = {
+            name: self.submit_job(
+                f"Clone {name}",
+                functools.partial(
+                    clone_repository,
+                    name,
+                    self.repos[name],
+                    lambda name, line: console.write(line, section=name),
+                ),
+                resource="network",
+            )
+            for name in names
+        }
+        self.wait_for_jobs(
+            list(jobs.values()),
+            lambda _: self.on_bulk_clone_complete(
+                console,
+                {
+                    name: job.result or {
+                        "returncode": -1,
+                        "duration": job.duration or 0.0,
+                    }
+                    for name, job in jobs.items()
+                },
+            ),
+        )
+
+    def on_bulk_clone_complete(self, console, results):
+        """Write the summary of the finished clones."""
+        failures = sorted(
+            name for name, values in results.items() if values["returncode"]
+        )
+        width = max(map(len, results)) + 2
+        lines = ["", "===== Summary =====", ""]
+        for name, values in sorted(
+            results.items(),
+            key=lambda item: item[1]["duration"],
+            reverse=True,
+        ):
+            status = "FAILED" if values["returncode"] else "ok"
+            lines.append(
+                f"{name:<{width}}{status:<8}{values['duration']:8.1f}s",
+            )
+        lines.append("")
+        lines.append(
+            f"Cloned {len(results) - len(failures)} of {len(results)}"
+            f" repositories.",
         )
-        self.add_back_button(lambda o=option: self.run(plugin_name=o))
+        if failures:
+            lines.append(f"Failed: {', '.join(failures)}")
+        console.write("\n".join(lines) + "\n")
+
+        workspace.refresh()
+        for name in results:
+            if name in workspace:
+                self.repos.pop(name, None)
+        self.add_back_button(self.run)
@@ -6,17 +6,18 @@
 # >> IMPORTS
 # =============================================================================
 # Python
-from path import Path
+import functools
+import tkinter as tk
 
 # Package
-from common.constants import (
-    LINK_BASE_DIR,
-    START_DIR,
-    PLUGIN_LIST,
-    config,
-)
-from common.functions import get_link_directory_command, get_link_file_command
 from common.interface import BaseInterface
+from common.link_manifest import link_manifest
+from common.link_planner import (
+    format_link_plan,
+    get_plan_operations,
+    plan_links,
+)
+from common.workspace import workspace
 
 
 # =============================================================================
@@ -25,86 +26,109 @@ from common.interface import BaseInterface
 class Interface(BaseInterface):
 
     name = "Plugin Linker"
+    dry_run = None
+    picker = None
 
     def run(self):
         self.window.title(self.name)
-        self.clear_grid()
-        self.create_grid(data=PLUGIN_LIST)
-        self.add_back_button(self.on_back_to_main)
+        workspace.refresh()
+        self.show_screen(
+            "picker",
+            build=self.build_picker_screen,
+            update=lambda _: self.picker.set_items(workspace.names),
+        )
+
+    def build_picker_screen(self, frame):
+        """Build the plugin picker and its buttons in the frame."""
+        self.picker = self.create_picker(
+            data=workspace.names,
+            actions={
+                "Link Selected": self.link,
+                "Verify Selected": functools.partial(
+                    self.on_manifest_action,
+                    "verify",
+                ),
+                "Repair Selected": functools.partial(
+                    self.on_manifest_action,
+                    "repair",
+                ),
+                "Unlink Selected": functools.partial(
+                    self.on_manifest_action,
+                    "unlink",
+                ),
+            },
+            parent=frame,
+        )
+        self.add_back_button(self.on_back_to_main, parent=frame)
+        link_all_button = tk.Button(
+            frame,
+            text="Link All",
+            command=self.on_link_all,
+        )
+        link_all_button.place(x=70, y=730)
+        self.dry_run = tk.BooleanVar(frame, value=False)
+        dry_run_button = tk.Checkbutton(
+            frame,
+            text="Dry run",
+            variable=self.dry_run,
+        )
+        dry_run_button.place(x=140, y=730)
 
     def on_click(self, option):
+        self.link([option])
+
+    def on_link_all(self):
+        """Link every plugin and prune all dangling links."""
+        self.link(workspace.names, prune_all=True)
+
+    def link(self, plugin_names, *, prune_all=False):
+        """Plan the plugins' links in the background, then apply the plan."""
+        dry_run = self.dry_run.get()
         self.clear_grid()
         console = self.get_console()
-        commands = self.get_all_link_commands(option)
-        self.execute_console_commands(
-            console=console,
-            commands=commands,
+        console.write("Planning links...\n")
+
+        def get_plan():
+            plan = plan_links(plugin_names, prune_all=prune_all)
+
+            # Record links that already existed before the manifest did
+            if not dry_run:
+                link_manifest.adopt(plan["linked"])
+            return plan
+
+        self.run_in_background(
+            get_plan,
+            lambda plan: self.on_plan_complete(console, plan, dry_run),
+            name="Plan links",
+            resource="disk",
         )
         self.add_back_button(self.run)
 
-    def get_all_link_commands(self, plugin_name):
-        commands = []
-        for path, extensions in {
-            config["CONFIG_BASE_PATH"]: ['cfg', 'ini'],
-            config["DATA_BASE_PATH"]: ['ini', 'json'],
-            config["DOCS_BASE_PATH"]: [],
-            config["EVENTS_BASE_PATH"]: [],
-            config["LOGS_BASE_PATH"]: [],
-            config["PLUGIN_BASE_PATH"]: [],
-            config["SOUND_BASE_PATH"]: ['mp3', 'wav'],
-            config["TRANSLATIONS_BASE_PATH"]: [],
-        }.items():
-            commands.extend(
-                self.get_link_commands(
-                    plugin_name,
-                    path,
-                    extensions=extensions,
-                )
-            )
-
-        translations_path = Path(config["TRANSLATIONS_BASE_PATH"])
-        for values in config["CONDITIONAL_PYTHON_FILES"].values():
-            path = values.get("translations_file_path")
-            if not path:
-                continue
-
-            commands.extend(
-                self.get_link_commands(
-                    plugin_name,
-                    translations_path / path,
-                    extensions=["ini"],
-                )
-            )
-
-        for path in config["CONDITIONAL_PATHS"].values():
-            if not path.startswith(translations_path):
-                continue
-
-            commands.extend(
-                self.get_link_commands(
-                    plugin_name,
-                    path,
-                )
-            )
-
-        return commands
-
-    @staticmethod
-    def get_link_commands(plugin_name, *args, extensions=None):
-        """Link the directory using the given arguments."""
-        extensions = extensions or []
-        plugin_path = START_DIR / plugin_name
-        src = plugin_path.joinpath(*args, plugin_name)
-
-        # Link the directory?
-        if src.is_dir():
-            dest = LINK_BASE_DIR.joinpath(*args, plugin_name)
-            if not dest.is_dir():
-                yield get_link_directory_command(src, dest)
-
-        for extension in extensions:
-            new_src = src + f".{extension}"
-            if new_src.is_file():
-                dest = LINK_BASE_DIR.joinpath(*args, plugin_name) + f".{extension}"
-                if not dest.is_file():
-                    yield get_link_file_command(new_src, dest)
+    def on_plan_complete(self, console, plan, dry_run):
+        """Write the plan's summary and apply its operations."""
+        if not console.winfo_exists():
+            return
+
+        lines = format_link_plan(plan)
+        console.write(f"{lines[0]}\n")
+        for line in lines[1:]:
+            console.write(f"{line}\n", "stderr")
+        self.execute_link_operations(
+            console=console,
+            operations=get_plan_operations(plan),
+            dry_run=dry_run,
+        )
+
+    def on_manifest_action(self, action, plugin_names):
+        """Verify, repair or unlink the plugins' recorded links."""
+        dry_run = self.dry_run.get()
+        self.clear_grid()
+        console = self.get_console()
+        self.execute_manifest_action(
+            console=console,
+            action=action,
+            owner_type="plugin",
+            names=plugin_names,
+            dry_run=dry_run,
+        )
+        self.add_back_button(self.run)
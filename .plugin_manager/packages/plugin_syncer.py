@@ -0,0 +1,122 @@
+# ../plugin_syncer.py
+
+"""Fetches and fast-forwards every plugin repository in the workspace."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import functools
+import itertools
+import tkinter as tk
+
+# Package
+from common.git_sync import (
+    format_sync_table,
+    get_failed_result,
+    sync_repository,
+)
+from common.interface import BaseInterface
+from common.workspace import workspace
+
+# =============================================================================
+# >> GLOBAL VARIABLES
+# =============================================================================
+_sync_options = {
+    "Fetch All": False,
+    "Fetch and Fast-Forward All": True,
+}
+
+
+# =============================================================================
+# >> CLASSES
+# =============================================================================
+class Interface(BaseInterface):
+    """Syncs every plugin's git repository with its upstream."""
+
+    name = "Plugin Syncer"
+
+    def run(self):
+        """Show the sync options."""
+        self.window.title(self.name)
+        self.show_screen("menu", build=self.build_menu_screen)
+
+    def build_menu_screen(self, frame):
+        """Build a button for each sync option in the frame."""
+        button_frame = tk.Frame(frame)
+        button_frame.pack(pady=10)
+        for label in _sync_options:
+            button = tk.Button(
+                button_frame,
+                text=label,
+                command=lambda option=label: self.on_click(option),
+                width=30,
+            )
+            button.pack(pady=2)
+        self.add_back_button(self.on_back_to_main, parent=frame)
+
+    def on_click(self, option):
+        """Sync every repository, using the clicked option."""
+        self.clear_grid()
+        console = self.get_console()
+        workspace.refresh()
+        repos = {
+            name: values["path"]
+            for name, values in sorted(workspace.items())
+            if values["is_git"]
+        }
+        console.write(f"Syncing {len(repos)} repositories...\n")
+        completed = itertools.count(1)
+        fast_forward = _sync_options[option]
+
+        def sync(name, path):
+            result = sync_repository(
+                name,
+                path,
+                fast_forward=fast_forward,
+            )
+            if result["error"]:
+                status = "FAILED"
+            elif result["upstream"] is False:
+                status = "skipped, no upstream"
+            else:
+                status = "done"
+            console.write(
+                f"[{next(completed)}/{len(repos)}] {name} {status}\n",
+            )
+            return result
+
+        jobs = {
+            name: self.submit_job(
+                f"Sync {name}",
+                functools.partial(sync, name, path),
+                resource="git",
+            )
+            for name, path in repos.items()
+        }
+        self.wait_for_jobs(
+            list(jobs.values()),
+            lambda _: self.on_sync_complete(
+                console,
+                [
+                    _get_job_result(name, job)
+                    for name, job in sorted(jobs.items())
+                ],
+            ),
+        )
+
+    def on_sync_complete(self, console, results):
+        """Write the table summarizing the synced repositories."""
+        console.write("\n" + "\n".join(format_sync_table(results)) + "\n")
+        workspace.refresh()
+        self.add_back_button(self.run)
+
+
+# =============================================================================
+# >> HELPER FUNCTIONS
+# =============================================================================
+def _get_job_result(name, job):
+    # A job that raised or was cancelled never returned a result
+    if job.result is not None:
+        return job.result
+    return get_failed_result(name, job.error or job.status)
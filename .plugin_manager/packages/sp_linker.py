@@ -5,37 +5,23 @@
 # =============================================================================
 # >> IMPORTS
 # =============================================================================
-# Site-package
-from configobj import ConfigObj
-from path import Path
+# Python
+import functools
+import tkinter as tk
 
 # Package
-from common.constants import (
-    PLATFORM,
-    START_DIR,
-    config,
-)
-from common.functions import get_link_directory_command, get_link_file_command
+from common.fs_snapshot import FileSystemSnapshot
 from common.interface import BaseInterface
-
-# =============================================================================
-# >> GLOBAL VARIABLES
-# =============================================================================
-_binary = "dll" if PLATFORM == "windows" else "so"
-SOURCE_BINARY = f"source-python.{_binary}"
-CORE_BINARY = f"core.{_binary}"
-SOURCE_PYTHON_DIR = Path(config["SOURCE_PYTHON_DIRECTORY"])
-SOURCE_PYTHON_ADDONS_DIR = SOURCE_PYTHON_DIR / "addons" / "source-python"
-SOURCE_PYTHON_BUILDS_DIR = SOURCE_PYTHON_DIR.joinpath(
-    "src",
-    "Builds",
-    "Windows" if PLATFORM == "windows" else "Linux",
+from common.link_collector import (
+    find_dangling_links,
+    get_collect_roots,
+    remove_dangling_links,
+)
+from common.links import format_link_result
+from common.source_python import (
+    get_server_link_operations,
+    get_supported_games,
 )
-source_python_directories = {
-    x.stem for x in SOURCE_PYTHON_DIR.dirs()
-    if not x.stem.startswith((".", "_")) and
-    x.stem not in ("addons", "src")
-}
 
 
 # =============================================================================
@@ -44,116 +30,148 @@ source_python_directories = {
 class Interface(BaseInterface):
 
     name = "Source.Python Linker"
+    supported_games = None
+    dry_run = None
+    picker = None
 
-    def run(self):
+    def run(self, *, force=False):
+        """Show the game picker, rescanning the servers if forced."""
         self.window.title(self.name)
-        self.clear_grid()
-        self.create_grid(data=supported_games)
-        self.add_back_button(self.on_back_to_main)
+        self.supported_games = get_supported_games(force=force)
+        self.show_screen(
+            "picker",
+            build=self.build_picker_screen,
+            update=lambda _: self.picker.set_items(
+                sorted(self.supported_games),
+            ),
+        )
+
+    def build_picker_screen(self, frame):
+        """Build the game picker and its buttons in the frame."""
+        self.picker = self.create_picker(
+            data=sorted(self.supported_games),
+            actions={
+                "Link Selected": self.link,
+                "Verify Selected": functools.partial(
+                    self.on_manifest_action,
+                    "verify",
+                ),
+                "Repair Selected": functools.partial(
+                    self.on_manifest_action,
+                    "repair",
+                ),
+                "Unlink Selected": functools.partial(
+                    self.on_manifest_action,
+                    "unlink",
+                ),
+            },
+            parent=frame,
+        )
+        self.add_back_button(self.on_back_to_main, parent=frame)
+        rescan_button = tk.Button(
+            frame,
+            text="Rescan",
+            command=lambda: self.run(force=True),
+        )
+        rescan_button.place(x=70, y=730)
+        self.dry_run = tk.BooleanVar(frame, value=False)
+        dry_run_button = tk.Checkbutton(
+            frame,
+            text="Dry run",
+            variable=self.dry_run,
+        )
+        dry_run_button.place(x=140, y=730)
+        remove_dangling_button = tk.Button(
+            frame,
+            text="Remove Dangling",
+            command=self.on_remove_dangling,
+        )
+        remove_dangling_button.place(x=220, y=730)
 
     def on_click(self, option):
+        self.link([option])
+
+    def link(self, games):
+        """Link Source.Python to the games."""
+        dry_run = self.dry_run.get()
         self.clear_grid()
         console = self.get_console()
-        commands = self.get_all_link_commands(option)
-        self.execute_console_commands(
+        snapshot = FileSystemSnapshot()
+        operations = [
+            operation | {"game": game}
+            for game in games
+            for operation in get_server_link_operations(
+                self.supported_games[game],
+                snapshot,
+            )
+        ]
+        self.execute_link_operations(
             console=console,
-            commands=commands,
+            operations=operations,
+            dry_run=dry_run,
         )
         self.add_back_button(self.run)
 
-    @staticmethod
-    def get_all_link_commands(option):
-        commands = []
-        path = supported_games[option]["directory"]
-        branch = supported_games[option]["branch"]
-        for dir_name in source_python_directories:
-            directory = path / dir_name
-            if not directory.is_dir():
-                directory.makedirs()
-
-            sp_dir = directory / "source-python"
-            if sp_dir.is_dir():
-                continue
-
-            commands.append(
-                get_link_directory_command(
-                    src=SOURCE_PYTHON_DIR / dir_name / "source-python",
-                    dest=sp_dir,
-                )
-            )
+    def on_remove_dangling(self):
+        """Search for dangling links in the background, then remove them."""
+        dry_run = self.dry_run.get()
+        self.clear_grid()
+        console = self.get_console()
+        roots = get_collect_roots(self.supported_games)
+        console.write(
+            f"Searching {len(roots)} directories for dangling links...\n",
+        )
+        self.run_in_background(
+            lambda: find_dangling_links(roots),
+            lambda operations: self.on_dangling_found(
+                console,
+                operations,
+                dry_run,
+            ),
+            name="Find dangling links",
+            resource="disk",
+        )
+        self.add_back_button(self.run)
 
-        server_addons = path / "addons" / "source-python"
-        server_addons_bin = server_addons / "bin"
-        if not server_addons_bin.is_dir():
-            server_addons_bin.makedirs()
+    def on_dangling_found(self, console, operations, dry_run):
+        """Remove the dangling links found, writing each result."""
+        if not console.winfo_exists():
+            return
 
-        for dir_name in SOURCE_PYTHON_ADDONS_DIR.dirs():
-            directory = server_addons / dir_name.stem
-            if directory.is_dir():
-                continue
+        if not operations:
+            console.write("No dangling links found.\n")
+            return
 
-            commands.append(
-                get_link_directory_command(
-                    src=dir_name,
-                    dest=directory,
-                )
-            )
+        console.write(f"Found {len(operations)} dangling links.\n")
 
-        vdf = path / "addons" / "source-python.vdf"
-        if not vdf.is_file():
-            SOURCE_PYTHON_DIR.joinpath("addons", "source-python.vdf").copy(vdf)
-
-        build_dir = SOURCE_PYTHON_BUILDS_DIR / branch
-        if PLATFORM == "windows":
-            build_dir = build_dir / "Release"
-
-        for src, dest in (
-            (build_dir / SOURCE_BINARY, path / "addons" / SOURCE_BINARY),
-            (build_dir / CORE_BINARY, server_addons_bin / CORE_BINARY)
-        ):
-            if src.is_file() and not dest.is_file():
-                print(3, src, dest)
-                commands.append(
-                    get_link_file_command(
-                        src=src,
-                        dest=dest,
-                    )
+        def on_results(results):
+            for result in results:
+                console.write(
+                    f"[{result['owner']}] {format_link_result(result)}\n",
+                    "stdout" if result["error"] is None else "stderr",
                 )
 
-        return commands
-
+        self.run_in_background(
+            lambda: remove_dangling_links(
+                operations,
+                dry_run=dry_run,
+                on_results=on_results,
+            ),
+            lambda _: None,
+            name="Remove dangling links",
+            resource="disk",
+        )
 
-# =============================================================================
-# >> HELPER FUNCTIONS
-# =============================================================================
-def _get_supported_games():
-    games = {}
-    server_directories = config["SERVER_DIRECTORIES"]
-    if isinstance(server_directories, str):
-        server_directories = [server_directories]
-
-    _check_files = ["srcds.exe", "srcds_run", "srcds_linux"]
-    _support = ConfigObj(
-        START_DIR / ".plugin_manager" / "tools" / "support.ini"
-    )
-    for _directory in server_directories:
-        _path = Path(_directory)
-        for _check_directory in _path.dirs():
-            if not any(
-                _check_directory.joinpath(_check_file).is_file()
-                for _check_file in _check_files
-            ):
-                continue
-            for _game, _values in _support.items():
-                _game_dir = _check_directory / _values["folder"]
-                if not _game_dir.is_dir():
-                    continue
-                if _game in games:
-                    continue
-                games[_game] = {
-                    "directory": _game_dir,
-                    "branch": _values["branch"],
-                }
-    return games
-
-supported_games = _get_supported_games()
+    def on_manifest_action(self, action, games):
+        """Verify, repair or unlink the games' recorded links."""
+        dry_run = self.dry_run.get()
+        self.clear_grid()
+        console = self.get_console()
+        self.execute_manifest_action(
+            console=console,
+            action=action,
+            owner_type="game",
+            names=games,
+            dry_run=dry_run,
+        )
+        self.add_back_button(self.run)
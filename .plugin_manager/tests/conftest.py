@@ -0,0 +1,12 @@
+# ../tests/conftest.py
+
+"""Makes the common package importable from the tests."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "packages"))
@@ -0,0 +1,203 @@
+# ../tests/test_github_client.py
+
+"""Tests GitHubClient against a local stand-in for the GitHub API."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Site-Package
+import pytest
+
+# Package
+from common.github_client import GitHubClient
+from common.http_cache import HTTPCache
+
+
+# =============================================================================
+# >> HELPER CLASSES
+# =============================================================================
+class FakeGitHub(ThreadingHTTPServer):
+    """Serves {path: [page bodies]} with Link and ETag headers.
+
+    Every request is recorded as (path, query, If-None-Match header).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pages):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.pages = pages
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if_none_match = self.headers.get("If-None-Match")
+        with self.server.lock:
+            self.server.requests.append((parts.path, query, if_none_match))
+
+        pages = self.server.pages.get(parts.path)
+        if pages is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        page = int(query.get("page", 1))
+        etag = f'"{parts.path}-{page}"'
+        if if_none_match == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        body = json.dumps(pages[page - 1]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if len(pages) > 1:
+            self.send_header("Link", self.get_links(parts.path, query, pages))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_links(self, path, query, pages):
+        links = []
+        page = int(query.get("page", 1))
+        for rel, number in (("next", page + 1), ("last", len(pages))):
+            if number > len(pages):
+                continue
+            params = "&".join(
+                f"{key}={value}" for key, value in
+                (query | {"page": number}).items()
+            )
+            links.append(f'<{self.server.url}{path}?{params}>; rel="{rel}"')
+        return ", ".join(links)
+
+    def log_message(self, *args):
+        pass
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(pages):
+        server = FakeGitHub(pages)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _repos(*names):
+    return [{"name": name} for name in names]
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+def test_pages_are_followed_through_link_header(serve):
+    server = serve({
+        "/users/author/repos": [
+            _repos("one", "two"),
+            _repos("three"),
+            _repos("four"),
+        ],
+        "/orgs/org/repos": [_repos("five")],
+    })
+    client = GitHubClient(base_url=server.url)
+    items = client.list_repositories(users=["author"], orgs=["org"])
+
+    assert [item["name"] for item in items] == [
+        "one", "two", "five", "three", "four",
+    ]
+    pages = sorted(
+        (path, query["page"]) for path, query, _ in server.requests
+    )
+    assert pages == [
+        ("/orgs/org/repos", "1"),
+        ("/users/author/repos", "1"),
+        ("/users/author/repos", "2"),
+        ("/users/author/repos", "3"),
+    ]
+
+
+def test_missing_owner_is_skipped(serve, capsys):
+    server = serve({"/orgs/org/repos": [_repos("five")]})
+    client = GitHubClient(base_url=server.url)
+    items = client.list_repositories(users=["missing"], orgs=["org"])
+
+    assert [item["name"] for item in items] == ["five"]
+    assert "404" in capsys.readouterr().out
+
+
+def test_not_modified_pages_are_read_from_cache(serve, tmp_path):
+    server = serve({
+        "/users/author/repos": [_repos("one"), _repos("two")],
+    })
+    cache = HTTPCache(tmp_path)
+    first = GitHubClient(base_url=server.url, cache=cache)
+    assert first.list_repositories(users=["author"]) == _repos("one", "two")
+    assert all(etag is None for *_, etag in server.requests)
+
+    server.requests.clear()
+    second = GitHubClient(base_url=server.url, cache=cache)
+    assert second.list_repositories(users=["author"]) == _repos("one", "two")
+    assert sorted(etag for *_, etag in server.requests) == [
+        '"/users/author/repos-1"',
+        '"/users/author/repos-2"',
+    ]
+
+
+def test_force_skips_conditional_headers(serve, tmp_path):
+    server = serve({"/users/author/repos": [_repos("one")]})
+    cache = HTTPCache(tmp_path)
+    GitHubClient(base_url=server.url, cache=cache).list_repositories(
+        users=["author"],
+    )
+
+    server.requests.clear()
+    client = GitHubClient(base_url=server.url, cache=cache, force=True)
+    assert client.list_repositories(users=["author"]) == _repos("one")
+    assert [etag for *_, etag in server.requests] == [None]
+
+
+def test_search_collects_items_of_every_page(serve):
+    server = serve({
+        "/search/repositories": [
+            {"total_count": 3, "items": _repos("one", "two")},
+            {"total_count": 3, "items": _repos("three")},
+        ],
+    })
+    client = GitHubClient(base_url=server.url)
+    items = client.search_repositories("user:author topic:plugin")
+
+    assert [item["name"] for item in items] == ["one", "two", "three"]
+    assert {query["q"] for _, query, _ in server.requests} == {
+        "user:author topic:plugin",
+    }
+    assert sorted(query["page"] for _, query, _ in server.requests) == [
+        "1", "2",
+    ]
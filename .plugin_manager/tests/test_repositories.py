@@ -0,0 +1,60 @@
+# ../tests/test_repositories.py
+
+"""Tests the local filtering of the repositories listed from GitHub."""
+
+# =============================================================================
+# >> IMPORTS
+# =============================================================================
+# Python
+from pathlib import Path
+
+# Site-Package
+import pytest
+
+# The package's constants are read from the workspace's config.ini
+if not (Path(__file__).resolve().parents[2] / "config.ini").is_file():
+    pytest.skip(
+        "the workspace's config.ini does not exist",
+        allow_module_level=True,
+    )
+
+# Package
+from common import repositories
+
+
+# =============================================================================
+# >> FIXTURES
+# =============================================================================
+@pytest.fixture
+def configured(monkeypatch):
+    monkeypatch.setattr(repositories, "MATCH_TOPICS", {"source-python"})
+    monkeypatch.setattr(repositories, "EXCLUDE_TOPICS", {"gungame"})
+    monkeypatch.setattr(repositories, "CONVERSIONS", {"SP": "Sp"})
+    monkeypatch.setattr(repositories, "workspace", {"cloned_plugin": {}})
+
+
+def _repo(name, topics=("source-python",), *, fork=False, archived=False):
+    return {
+        "name": name,
+        "topics": list(topics),
+        "fork": fork,
+        "archived": archived,
+        "ssh_url": f"git@github.com:author/{name}.git",
+    }
+
+
+# =============================================================================
+# >> TESTS
+# =============================================================================
+@pytest.mark.usefixtures("configured")
+def test_identify_repos_filters_locally():
+    repos = repositories.identify_repos([
+        _repo("SPAdmin"),
+        _repo("ForkedPlugin", fork=True),
+        _repo("OldPlugin", archived=True),
+        _repo("GunGameAddon", ("source-python", "gungame")),
+        _repo("OtherProject", ("python",)),
+        _repo("ClonedPlugin"),
+    ])
+
+    assert repos == {"sp_admin": "git@github.com:author/SPAdmin.git"}
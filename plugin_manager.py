@@ -2,21 +2,53 @@
 # >> IMPORTS
 # =============================================================================
 # Python
+import ast
 import configparser
+import hashlib
 import importlib
-import sys
+import json
+import re
+import site
 import subprocess
+import sys
+import tkinter as tk
 from contextlib import suppress
+from importlib import metadata
 from pathlib import Path
-import tkinter as tk
 
 
 # =============================================================================
 # >> CLASSES
 # =============================================================================
+class LazyCommand:
+    """Stores a command's metadata and imports its module on first use."""
+
+    def __init__(self, module_name, name, window, main_run):
+        """Store the command's metadata without importing its module."""
+        self.module_name = module_name
+        self.name = name
+        self.window = window
+        self.main_run = main_run
+        self._interface = None
+
+    @property
+    def interface(self):
+        """Return the command's interface, importing its module if needed."""
+        if self._interface is None:
+            module = importlib.import_module(self.module_name)
+            self._interface = module.Interface(self.window, self.main_run)
+        return self._interface
+
+    def run(self):
+        """Run the command's interface."""
+        self.interface.run()
+
+
 class PluginManager(dict):
 
     window = None
+    menu = None
+    exit_button = None
     disabled_commands = list()
 
     def __init__(self, *args, **kwargs):
@@ -34,12 +66,12 @@ class PluginManager(dict):
             return
 
         self.window.grid_rowconfigure(0, weight=1)
-        exit_button = tk.Button(
+        self.exit_button = tk.Button(
             self.window,
             text="Exit",
             command=self.window.quit,
         )
-        exit_button.place(x=980, y=730)
+        self.exit_button.place(x=980, y=730)
 
     def populate_dictionary(self):
         package_path = self.base_path.joinpath("packages")
@@ -49,9 +81,35 @@ class PluginManager(dict):
                 continue
             if file.stem in self.disabled_commands:
                 continue
-            module = importlib.import_module(file.stem)
-            with suppress(AttributeError):
-                self[file.stem] = module.Interface(self.window, self.run)
+            name = self.get_interface_name(file)
+            if name is None:
+                continue
+            self[file.stem] = LazyCommand(
+                module_name=file.stem,
+                name=name,
+                window=self.window,
+                main_run=self.run,
+            )
+
+    @staticmethod
+    def get_interface_name(file):
+        """Return the Interface's display name without importing the file."""
+        tree = ast.parse(file.read_text(), filename=str(file))
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef) or node.name != "Interface":
+                continue
+            for item in node.body:
+                if not isinstance(item, ast.Assign):
+                    continue
+                if not any(
+                    isinstance(target, ast.Name) and target.id == "name"
+                    for target in item.targets
+                ):
+                    continue
+                with suppress(ValueError):
+                    return str(ast.literal_eval(item.value))
+            return None
+        return None
 
     def run(self):
         call_mainloop = False
@@ -63,60 +121,112 @@ class PluginManager(dict):
         if not self:
             self.populate_dictionary()
 
+        # The menu is only built once and shown again when returning to it
+        if self.menu is None:
+            self.menu = self.create_menu()
+        self.menu.place(x=0, y=0, relwidth=1, relheight=1)
+        self.menu.tkraise()
+        self.exit_button.lift()
+        jobs_panel = self.window.children.get("jobs_panel")
+        if jobs_panel is not None:
+            jobs_panel.lift()
+
+        if call_mainloop:
+            self.window.mainloop()
+
+    def create_menu(self):
+        """Return the main menu's frame, with a button for each command."""
+        menu = tk.Frame(self.window, name="screen_main")
+        menu.grid_rowconfigure(0, weight=1)
         for i, (key, value) in enumerate(sorted(self.items())):
             button = tk.Button(
-                self.window,
+                menu,
                 text=value.name,
                 command=lambda l=key: self.on_click(l),
             )
             button.grid(row=0, column=i, padx=10, pady=10, sticky="ew")
-        for i in range(len(self)):
-            self.window.grid_columnconfigure(i, weight=1)
-
-        if call_mainloop:
-            self.window.mainloop()
+            menu.grid_columnconfigure(i, weight=1)
+        return menu
 
     def on_click(self, option):
-        for widget in self.window.winfo_children():
-            if widget.cget("text") == "Exit":
-                continue
-            widget.destroy()
-
+        self.menu.place_forget()
         self[option].run()
 
     def install_requirements(self):
-        result = subprocess.run(
-            args=[sys.executable, "-m", "pip", "freeze"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        pip_requirements = dict(
-            line.split("==")
-            for line in result.stdout.splitlines()
-            if "==" in line
-        )
         requirements_path = self.base_path.joinpath(
             "tools",
             "requirements.txt",
         )
+        fingerprint_path = self.base_path.joinpath(
+            "cache",
+            "requirements.json",
+        )
+        fingerprint = self.get_requirements_fingerprint(requirements_path)
+        with suppress(OSError, ValueError):
+            if json.loads(fingerprint_path.read_text()) == fingerprint:
+                return
+
+        if not self.requirements_satisfied(requirements_path):
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "pip",
+                    "install",
+                    "-r",
+                    requirements_path,
+                ],
+                check=False,
+            )
+            if result.returncode:
+                return
+
+            # Installing changes the site-packages directories
+            fingerprint = self.get_requirements_fingerprint(requirements_path)
+
+        fingerprint_path.parent.mkdir(exist_ok=True)
+        fingerprint_path.write_text(json.dumps(fingerprint))
+
+    @staticmethod
+    def get_requirements_fingerprint(requirements_path):
+        """Return the values that invalidate a previous requirements check."""
+        site_packages = [*site.getsitepackages(), site.getusersitepackages()]
+        return {
+            "requirements": hashlib.sha256(
+                requirements_path.read_bytes(),
+            ).hexdigest(),
+            "executable": sys.executable,
+            "site_packages": {
+                path: Path(path).stat().st_mtime_ns
+                for path in site_packages
+                if Path(path).is_dir()
+            },
+        }
+
+    def requirements_satisfied(self, requirements_path):
+        """Return whether every pinned requirement is installed."""
         with open(requirements_path) as _open_file:
             requirements = dict(
-                line.split("==")
+                line.strip().split("==")
                 for line in _open_file.readlines()
                 if "==" in line
             )
         for requirement, value in requirements.items():
-            if requirement not in pip_requirements:
-                break
-            if value < pip_requirements[requirement]:
-                break
-        else:
-            return
-    
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", requirements_path]
-        )
+            try:
+                installed = metadata.version(requirement)
+            except metadata.PackageNotFoundError:
+                return False
+            if self.parse_version(installed) < self.parse_version(value):
+                return False
+        return True
+
+    @staticmethod
+    def parse_version(value):
+        """Return the numeric release segments of the given version."""
+        match = re.match(r"\d+(\.\d+)*", value.strip())
+        if match is None:
+            return ()
+        return tuple(map(int, match.group().split(".")))
 
     def check_config(self):
         if not self.config_path.is_file():
@@ -146,5 +256,7 @@ class PluginManager(dict):
         self.window.mainloop()
 
 
-instance = PluginManager()
-instance.run()
+# Guarded so process pool workers can import this module on Windows
+if __name__ == "__main__":
+    instance = PluginManager()
+    instance.run()
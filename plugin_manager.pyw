@@ -2,3 +2,7 @@
 # This also allows the .py to exist for Linux use
 # noinspection PyUnresolvedReferences
 import plugin_manager
+
+if __name__ == "__main__":
+    instance = plugin_manager.PluginManager()
+    instance.run()